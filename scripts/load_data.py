@@ -12,6 +12,7 @@ Total: 22 CSV files → Complete supplement safety knowledge graph
 
 import logging
 import os
+import sys
 from pathlib import Path
 import pandas as pd
 from dotenv import load_dotenv
@@ -246,6 +247,30 @@ class CompleteKnowledgeGraphLoader:
             
             "CREATE INDEX category_name_idx IF NOT EXISTS "
             "FOR (c:Category) ON (c.category)",
+            
+            # Lowercased copies of the names so case-insensitive lookups
+            # can seek the index instead of calling toLower() per node
+            "CREATE INDEX supplement_name_lower_idx IF NOT EXISTS "
+            "FOR (s:Supplement) ON (s.supplement_name_lower)",
+            
+            "CREATE INDEX medication_name_lower_idx IF NOT EXISTS "
+            "FOR (m:Medication) ON (m.medication_name_lower)",
+            
+            "CREATE INDEX symptom_name_lower_idx IF NOT EXISTS "
+            "FOR (s:Symptom) ON (s.symptom_name_lower)",
+            
+            "CREATE INDEX dietary_restriction_name_lower_idx IF NOT EXISTS "
+            "FOR (dr:DietaryRestriction) ON (dr.dietary_restriction_name_lower)",
+            
+            # MedicalCondition nodes aren't produced by this loader yet; the
+            # index is declared so recommendation lookups seek once they are
+            "CREATE INDEX condition_name_lower_idx IF NOT EXISTS "
+            "FOR (c:MedicalCondition) ON (c.condition_name_lower)",
+            
+            # ========== FULL-TEXT INDEXES ==========
+            # Used by the recommendation agent's symptom search
+            "CREATE FULLTEXT INDEX symptom_name_fulltext IF NOT EXISTS "
+            "FOR (s:Symptom) ON EACH [s.symptom_name]",
         ]
 
         with self.driver.session() as session:
@@ -257,6 +282,30 @@ class CompleteKnowledgeGraphLoader:
 
         logger.info("✓ Created all constraints and indexes")
 
+    def backfill_lowercase_names(self):
+        """
+        Populate the *_name_lower lookup properties on an already-loaded graph.
+        Safe to re-run; only nodes missing the property are touched.
+        """
+        backfills = [
+            ("Supplement", "supplement_name"),
+            ("Medication", "medication_name"),
+            ("Symptom", "symptom_name"),
+            ("DietaryRestriction", "dietary_restriction_name"),
+            ("MedicalCondition", "condition_name"),
+        ]
+
+        with self.driver.session() as session:
+            for label, prop in backfills:
+                result = session.run(
+                    f"MATCH (n:{label}) "
+                    f"WHERE n.{prop} IS NOT NULL AND n.{prop}_lower IS NULL "
+                    f"SET n.{prop}_lower = toLower(n.{prop}) "
+                    f"RETURN count(n) AS updated"
+                )
+                updated = result.single()["updated"]
+                logger.info(f"✓ Backfilled {prop}_lower on {updated:,} {label} nodes")
+
     def batch_execute(self, query: str, data: list, batch_size: int = 5000, desc: str = "Processing"):
         """
         Execute Cypher query in batches using UNWIND for optimal performance.
@@ -504,6 +553,7 @@ class CompleteKnowledgeGraphLoader:
         CREATE (s:Supplement {
             supplement_id: row.supplement_id,
             supplement_name: row.supplement_name,
+            supplement_name_lower: toLower(row.supplement_name),
             safety_rating: row.safety_rating
         })
         """
@@ -538,7 +588,8 @@ class CompleteKnowledgeGraphLoader:
         UNWIND $batch AS row
         CREATE (m:Medication {
             medication_id: row.medication_id,
-            medication_name: row.medication_name
+            medication_name: row.medication_name,
+            medication_name_lower: toLower(row.medication_name)
         })
         """
         
@@ -559,7 +610,8 @@ class CompleteKnowledgeGraphLoader:
         UNWIND $batch AS row
         CREATE (s:Symptom {
             symptom_id: row.symptom_id,
-            symptom_name: row.symptom_name
+            symptom_name: row.symptom_name,
+            symptom_name_lower: toLower(row.symptom_name)
         })
         """
         
@@ -689,6 +741,7 @@ class CompleteKnowledgeGraphLoader:
         CREATE (dr:DietaryRestriction {
             dietary_restriction_id: row.dietary_restriction_id,
             dietary_restriction_name: row.dietary_restriction_name,
+            dietary_restriction_name_lower: toLower(row.dietary_restriction_name),
             description: row.description
         })
         """
@@ -905,6 +958,13 @@ def main():
     loader = CompleteKnowledgeGraphLoader(uri, user, password)
 
     try:
+        # Upgrade an existing graph in place instead of reloading it
+        if "--backfill-lowercase" in sys.argv[1:]:
+            logger.info("Adding lowercase lookup properties and indexes...")
+            loader.create_constraints_and_indexes()
+            loader.backfill_lowercase_names()
+            return
+
         logger.info("=" * 70)
         logger.info("🚀 Starting COMPLETE Knowledge Graph Import")
         logger.info("=" * 70)
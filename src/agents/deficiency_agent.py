@@ -24,7 +24,11 @@ State keys written:
 import os
 from typing import Dict, Any, List
 
-from tools.query_executor import QueryExecutor
+from tools.query_executor import QueryExecutor, ResultCache
+
+
+# Lowercased restriction names → (rows, queries_run)
+_DEFICIENCY_CACHE = ResultCache(ttl=600)
 
 
 class DietaryDeficiencyAgent:
@@ -176,11 +180,19 @@ class DietaryDeficiencyAgent:
             (rows, queries_run) where rows is a list of dicts and
             queries_run is metadata for the debug panel.
         """
-        restrictions_lower = [r.lower() for r in restrictions]
+        restrictions_lower = list(dict.fromkeys(r.lower() for r in restrictions))
+
+        cache_key = tuple(sorted(restrictions_lower))
+        cached = _DEFICIENCY_CACHE.get(cache_key)
+        if cached is not None:
+            print("   ♻️  Using cached deficiency results for these restrictions")
+            return cached
 
+        # One index seek per restriction on the lowercased name property
         query = """
-        MATCH (dr:DietaryRestriction)-[r:DEFICIENT_IN]->(n:Nutrient)
-        WHERE toLower(dr.dietary_restriction_name) IN $restrictions
+        UNWIND $restrictions AS restriction
+        MATCH (dr:DietaryRestriction {dietary_restriction_name_lower: restriction})
+              -[r:DEFICIENT_IN]->(n:Nutrient)
         RETURN dr.dietary_restriction_name AS diet,
                n.nutrient_name             AS nutrient,
                n.category                  AS nutrient_category,
@@ -206,6 +218,8 @@ class DietaryDeficiencyAgent:
         }]
 
         rows = result['data'] if result['success'] else []
+        if result['success']:
+            _DEFICIENCY_CACHE.set(cache_key, (rows, queries_run))
         return rows, queries_run
 
     # ------------------------------------------------------------------
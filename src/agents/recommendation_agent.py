@@ -5,6 +5,12 @@ Finds safe supplement recommendations for conditions/symptoms.
 from typing import Dict, Any, List
 import os
 
+# Full-text index over Symptom.symptom_name. Created by
+# scripts/load_data.py (create_constraints_and_indexes):
+#   CREATE FULLTEXT INDEX symptom_name_fulltext IF NOT EXISTS
+#   FOR (s:Symptom) ON EACH [s.symptom_name]
+SYMPTOM_FULLTEXT_INDEX = "symptom_name_fulltext"
+
 
 class RecommendationAgent:
     """
@@ -113,7 +119,7 @@ class RecommendationAgent:
         return candidates
     
     
-    def _manual_symptom_search(self, condition: str) -> List[Dict]:
+    def _manual_symptom_search(self, condition: str, limit: int = 20) -> List[Dict]:
         """
         Manual Cypher query that matches your actual schema
         
@@ -122,23 +128,34 @@ class RecommendationAgent:
         - Symptom nodes: symptom_id, symptom_name
         - Relationship: (Supplement)-[:TREATS]->(Symptom)
         """
-        # Clean up the condition for matching
+        # Search the full-text index for the condition as a phrase instead of
+        # scanning every Symptom with toLower(...) CONTAINS; the best-scoring
+        # supplements are kept when the LIMIT cuts the list
         condition_clean = condition.lower().strip()
         
-        # Build a flexible Cypher query
         cypher = """
-        MATCH (s:Supplement)-[r:TREATS]->(sym:Symptom)
-        WHERE toLower(sym.symptom_name) CONTAINS $condition_lower
-        RETURN DISTINCT
+        CALL db.index.fulltext.queryNodes($index_name, $search) YIELD node AS sym, score
+        MATCH (s:Supplement)-[r:TREATS]->(sym)
+        WITH s, sym, score
+        ORDER BY score DESC
+        WITH s, max(score) AS relevance, collect(DISTINCT sym.symptom_name) AS symptoms
+        RETURN
             s.supplement_id AS supplement_id,
             s.supplement_name AS supplement,
             s.safety_rating AS safety_rating,
-            sym.symptom_name AS symptom,
-            'TREATS' AS relationship_type
-        ORDER BY s.supplement_name
+            symptoms[0] AS symptom,
+            symptoms,
+            'TREATS' AS relationship_type,
+            relevance
+        ORDER BY relevance DESC, supplement
+        LIMIT $limit
         """
         
-        params = {'condition_lower': condition_clean}
+        params = {
+            'index_name': SYMPTOM_FULLTEXT_INDEX,
+            'search': self._fulltext_phrase(condition_clean),
+            'limit': limit
+        }
         
         try:
             result = self.executor.execute(cypher, params)
@@ -155,6 +172,13 @@ class RecommendationAgent:
             return []
     
     
+    @staticmethod
+    def _fulltext_phrase(text: str) -> str:
+        """Quote text as a Lucene phrase so user input can't inject query syntax"""
+        escaped = text.replace('\\', '\\\\').replace('"', '\\"')
+        return f'"{escaped}"'
+    
+    
     def _broad_symptom_search(self, condition: str) -> List[Dict]:
         """
         Very broad search - returns all supplements and lets user decide
@@ -170,13 +194,15 @@ class RecommendationAgent:
         cypher = """
         MATCH (s:Supplement)-[r:TREATS]->(sym:Symptom)
         WHERE ANY(word IN $words WHERE toLower(sym.symptom_name) CONTAINS word)
-        RETURN DISTINCT
+        WITH s, collect(DISTINCT sym.symptom_name) AS symptoms
+        RETURN
             s.supplement_id AS supplement_id,
             s.supplement_name AS supplement,
             s.safety_rating AS safety_rating,
-            sym.symptom_name AS symptom,
+            symptoms[0] AS symptom,
+            symptoms,
             'TREATS' AS relationship_type
-        ORDER BY s.supplement_name
+        ORDER BY size(symptoms) DESC, supplement
         LIMIT 10
         """
         
@@ -221,6 +247,7 @@ class RecommendationAgent:
                 'symptom_treated': (row.get('symptom') or 
                                    row.get('symptom_name') or 
                                    row.get('sym.symptom_name')),
+                'symptoms_treated': row.get('symptoms') or [],
                 'safety_rating': (row.get('safety_rating') or 
                                  row.get('s.safety_rating') or 
                                  'UNKNOWN'),
@@ -17,7 +17,11 @@ from typing import Dict, Any, List
 import os
 
 from tools.query_generator import QueryGenerator, generate_comprehensive_safety_query
-from tools.query_executor import QueryExecutor, run_comprehensive_safety
+from tools.query_executor import QueryExecutor, ResultCache, run_comprehensive_safety
+
+
+# (supplement names, medication names) → (interactions, queries_run)
+_SAFETY_CACHE = ResultCache(ttl=600)
 
 
 class SafetyCheckAgent:
@@ -93,50 +97,22 @@ class SafetyCheckAgent:
         # ----------------------------------------------------------
         # 2. Run comprehensive safety check for each supplement
         # ----------------------------------------------------------
-        all_interactions = []
-        all_queries_run = []
-
-        for supp in supplement_names:
-            print(f"\n   --- Checking: {supp} ---")
-
-            # Generate and execute the comprehensive UNION query
-            query_dict = generate_comprehensive_safety_query(supp, medication_names)
-
-            if query_dict.get('error'):
-                print(f"   ❌ Query generation error: {query_dict['error']}")
-                continue
-
-            result = self.executor.execute_query_dict(query_dict)
-
-            # Track the query for the debug panel
-            all_queries_run.append({
-                'query_type': 'comprehensive_safety',
-                'supplement': supp,
-                'medications': medication_names,
-                'cypher': query_dict.get('query', ''),
-                'parameters': query_dict.get('parameters', {}),
-                'success': result['success'],
-                'result_count': result['count'],
-                'execution_time': result.get('execution_time', 0),
-            })
-
-            if result['success'] and result['data']:
-                for row in result['data']:
-                    interaction = {
-                        'supplement': row.get('supplement', supp),
-                        'target': row.get('target', ''),
-                        'description': row.get('description', ''),
-                        'severity': row.get('severity', 'UNKNOWN'),
-                        'detail': row.get('detail', ''),
-                        'pathway': row.get('pathway', 'UNKNOWN'),
-                    }
-                    all_interactions.append(interaction)
-                    print(f"   ⚠️  [{interaction['pathway']}] {supp} ↔ {interaction['target']}: {interaction['description'][:80]}")
-
-            elif result['success']:
-                print(f"   ✅ No interactions found for {supp}")
-            else:
-                print(f"   ❌ Query failed: {result.get('error')}")
+        cache_key = (
+            tuple(sorted(n.lower() for n in supplement_names)),
+            tuple(sorted(n.lower() for n in medication_names)),
+        )
+        cached = _SAFETY_CACHE.get(cache_key)
+        if cached is not None:
+            print("   ♻️  Using cached safety results for these inputs")
+            all_interactions, all_queries_run = (list(part) for part in cached)
+        else:
+            all_interactions, all_queries_run = self._run_safety_queries(
+                supplement_names, medication_names
+            )
+            # Cache only complete runs: one successful query per supplement
+            if (len(all_queries_run) == len(supplement_names)
+                    and all(q['success'] for q in all_queries_run)):
+                _SAFETY_CACHE.set(cache_key, (all_interactions, all_queries_run))
 
         # ----------------------------------------------------------
         # 3. Evaluate results
@@ -205,6 +181,60 @@ class SafetyCheckAgent:
     # Helpers
     # ------------------------------------------------------------------
 
+    def _run_safety_queries(self, supplement_names: List[str], medication_names: List[str]):
+        """
+        Run the comprehensive safety query once per supplement.
+
+        Returns:
+            (interactions, queries_run) for the results dict and debug panel
+        """
+        all_interactions = []
+        all_queries_run = []
+
+        for supp in supplement_names:
+            print(f"\n   --- Checking: {supp} ---")
+
+            # Generate and execute the comprehensive UNION query
+            query_dict = generate_comprehensive_safety_query(supp, medication_names)
+
+            if query_dict.get('error'):
+                print(f"   ❌ Query generation error: {query_dict['error']}")
+                continue
+
+            result = self.executor.execute_query_dict(query_dict)
+
+            # Track the query for the debug panel
+            all_queries_run.append({
+                'query_type': 'comprehensive_safety',
+                'supplement': supp,
+                'medications': medication_names,
+                'cypher': query_dict.get('query', ''),
+                'parameters': query_dict.get('parameters', {}),
+                'success': result['success'],
+                'result_count': result['count'],
+                'execution_time': result.get('execution_time', 0),
+            })
+
+            if result['success'] and result['data']:
+                for row in result['data']:
+                    interaction = {
+                        'supplement': row.get('supplement', supp),
+                        'target': row.get('target', ''),
+                        'description': row.get('description', ''),
+                        'severity': row.get('severity', 'UNKNOWN'),
+                        'detail': row.get('detail', ''),
+                        'pathway': row.get('pathway', 'UNKNOWN'),
+                    }
+                    all_interactions.append(interaction)
+                    print(f"   ⚠️  [{interaction['pathway']}] {supp} ↔ {interaction['target']}: {interaction['description'][:80]}")
+
+            elif result['success']:
+                print(f"   ✅ No interactions found for {supp}")
+            else:
+                print(f"   ❌ Query failed: {result.get('error')}")
+
+        return all_interactions, all_queries_run
+
     def _get_supplement_names(self, state: Dict) -> List[str]:
         """
         Get supplement names from state — merges ALL sources to ensure
@@ -10,8 +10,7 @@ The "brain" of the system. Makes high-level decisions about:
 Role: Orchestrates the entire workflow dynamically
 """
 
-import os
-from anthropic import Anthropic
+from tools.llm_client import get_anthropic_client
 from typing import Dict, Any
 from dotenv import load_dotenv
 
@@ -24,7 +23,7 @@ class SupervisorAgent:
     """
     
     def __init__(self):
-        self.client = Anthropic(api_key=os.getenv("ANTHROPIC_API_KEY"))
+        self.client = get_anthropic_client()
         self.model = "claude-sonnet-4-20250514"
     
     def __call__(self, state: Dict[str, Any]) -> Dict[str, Any]:
@@ -65,6 +64,7 @@ class SupervisorAgent:
         # Update state with decision
         state['supervisor_decision'] = decision['action']
         state['supervisor_reasoning'] = decision['reasoning']
+        state['pending_checks'] = evaluation['pending']
         state['iterations'] = state.get('iterations', 0) + 1
         
         print(f"🧠 SUPERVISOR: Decision → {decision['action']}")
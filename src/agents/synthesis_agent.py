@@ -10,9 +10,8 @@ Takes all findings and creates a personalized, evidence-based answer:
 Role: Final answer synthesis
 """
 
-from anthropic import Anthropic
+from tools.llm_client import get_anthropic_client
 from typing import Dict, Any
-import os
 
 
 class SynthesisAgent:
@@ -21,7 +20,7 @@ class SynthesisAgent:
     """
     
     def __init__(self):
-        self.client = Anthropic(api_key=os.getenv("ANTHROPIC_API_KEY"))
+        self.client = get_anthropic_client()
     
     
     def run(self, state: Dict[str, Any]) -> Dict[str, Any]:
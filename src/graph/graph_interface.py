@@ -5,12 +5,24 @@ Provides simplified access to the supplement-drug interaction database.
 """
 
 import logging
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
-from neo4j import GraphDatabase
+from neo4j import READ_ACCESS, GraphDatabase
 
 logger = logging.getLogger(__name__)
 
+# How long warm_up waits for indexes still building. The server default
+# (300s) would hold app startup for five minutes.
+INDEX_WAIT_SECONDS = 10
+
+# (label, name property, index on <property>_lower) that exact lookups
+# depend on; created and backfilled by scripts/load_data.py
+LOWERCASE_LOOKUPS: Tuple[Tuple[str, str, str], ...] = (
+    ("Supplement", "supplement_name", "supplement_name_lower_idx"),
+    ("Medication", "medication_name", "medication_name_lower_idx"),
+    ("DietaryRestriction", "dietary_restriction_name", "dietary_restriction_name_lower_idx"),
+)
+
 
 class GraphInterface:
     """
@@ -21,7 +33,14 @@ class GraphInterface:
     - Drug interactions, equivalence relationships, category similarities
     """
 
-    def __init__(self, uri: str, user: str, password: str):
+    def __init__(
+        self,
+        uri: str,
+        user: str,
+        password: str,
+        database: Optional[str] = None,
+        max_connection_pool_size: int = 100,
+    ):
         """
         Initialize Neo4j connection.
         
@@ -29,17 +48,105 @@ class GraphInterface:
             uri: Neo4j connection URI (e.g., "bolt://localhost:7687")
             user: Database username (usually "neo4j")
             password: Database password
+            database: Target database name; naming it up front saves the
+                driver a home-database lookup on every session
+            max_connection_pool_size: Upper bound on pooled connections
         """
+        self.database = database
         try:
-            self.driver = GraphDatabase.driver(uri, auth=(user, password))
+            self.driver = GraphDatabase.driver(
+                uri,
+                auth=(user, password),
+                max_connection_pool_size=max_connection_pool_size,
+            )
             # Test connection
-            with self.driver.session() as session:
+            with self._session() as session:
                 session.run("RETURN 1")
             logger.info("✓ Connected to Neo4j database")
         except Exception as e:
             logger.error(f"Failed to connect to Neo4j: {e}")
             raise
 
+    def _session(self, access_mode: Optional[str] = None):
+        """Open a session on the configured database."""
+        if access_mode:
+            return self.driver.session(database=self.database, default_access_mode=access_mode)
+        return self.driver.session(database=self.database)
+
+    def check_lowercase_lookups(self) -> None:
+        """
+        Fail loudly if the graph predates the *_name_lower lookup properties.
+        
+        Safety, deficiency and entity lookups match only on those properties,
+        so against an older graph they find nothing and a safety check would
+        report no interactions. Run `python scripts/load_data.py
+        --backfill-lowercase` to migrate.
+        
+        Raises:
+            RuntimeError: naming the missing indexes and properties
+        """
+        problems = []
+        with self._session(READ_ACCESS) as session:
+            # A still-populating index answers correctly (just slower), so
+            # only a missing or failed one is an error
+            usable = {
+                record["name"]
+                for record in session.run(
+                    "SHOW INDEXES YIELD name, state WHERE state <> 'FAILED' RETURN name"
+                )
+            }
+            for label, prop, index in LOWERCASE_LOOKUPS:
+                if index not in usable:
+                    problems.append(f"index {index} is missing or failed")
+                missing = session.run(
+                    f"MATCH (n:{label}) "
+                    f"WHERE n.{prop} IS NOT NULL AND n.{prop}_lower IS NULL "
+                    f"RETURN n LIMIT 1"
+                ).peek()
+                if missing is not None:
+                    problems.append(f"{label} nodes lack {prop}_lower")
+        if problems:
+            raise RuntimeError(
+                "Knowledge graph is missing lowercase lookup data ("
+                + "; ".join(problems)
+                + "). Run: python scripts/load_data.py --backfill-lowercase"
+            )
+
+    def warm_up(self, queries: Iterable[Tuple[str, Dict[str, Any]]]) -> int:
+        """
+        Prime Neo4j's page cache and query plan cache before real traffic.
+        
+        Waits briefly for indexes to come online, then runs each (query, parameters)
+        pair once and discards the rows. Failures are logged, never raised,
+        so a cold or partial database doesn't block startup.
+        
+        Returns:
+            Number of queries that ran successfully
+        """
+        warmed = 0
+        try:
+            with self._session() as session:
+                try:
+                    session.run(
+                        "CALL db.awaitIndexes($timeout)",
+                        timeout=INDEX_WAIT_SECONDS,
+                    ).consume()
+                except Exception as e:
+                    logger.warning(
+                        f"Indexes not online after {INDEX_WAIT_SECONDS}s; "
+                        f"warming anyway: {str(e)[:100]}"
+                    )
+                for query, parameters in queries:
+                    try:
+                        session.run(query, parameters).consume()
+                        warmed += 1
+                    except Exception as e:
+                        logger.warning(f"Warm-up query failed: {str(e)[:100]}")
+        except Exception as e:
+            logger.warning(f"Warm-up skipped: {e}")
+        logger.info(f"✓ Warmed {warmed} queries")
+        return warmed
+
     def close(self):
         """Close database connection."""
         if self.driver:
@@ -49,14 +156,18 @@ class GraphInterface:
     def execute_query(
         self, 
         cypher_query: str, 
-        parameters: Optional[Dict[str, Any]] = None
+        parameters: Optional[Dict[str, Any]] = None,
+        access_mode: Optional[str] = None,
     ) -> List[Dict[str, Any]]:
         """
         Execute a Cypher query and return results as list of dictionaries.
         
         Args:
-            cypher_query: Cypher query string
+            cypher_query: Cypher query string; bind values as $parameters
+                rather than formatting them in, so Neo4j can reuse the plan
             parameters: Optional parameters for the query
+            access_mode: "READ" lets a cluster route the query to a
+                follower or read replica; default is the driver's (WRITE)
             
         Returns:
             List of result records as dictionaries
@@ -65,7 +176,7 @@ class GraphInterface:
             Exception: If query execution fails
         """
         try:
-            with self.driver.session() as session:
+            with self._session(access_mode) as session:
                 result = session.run(cypher_query, parameters or {})
                 return [record.data() for record in result]
         except Exception as e:
@@ -80,7 +191,7 @@ class GraphInterface:
         Returns:
             Dictionary with node labels, relationship types, and properties
         """
-        with self.driver.session() as session:
+        with self._session() as session:
             # Get node labels
             labels_result = session.run(
                 "CALL db.labels() YIELD label RETURN collect(label) as labels"
@@ -142,15 +253,17 @@ class GraphInterface:
             List of distinct property values
         """
         try:
+            # Label and property can't be parameters, but the limit can:
+            # binding it keeps one cached plan per label/property pair
             query = (
                 f"MATCH (n:{label}) "
                 f"WHERE n.{property_name} IS NOT NULL "
                 f"RETURN DISTINCT n.{property_name} as value "
-                f"LIMIT {limit}"
+                f"LIMIT $limit"
             )
             
-            with self.driver.session() as session:
-                result = session.run(query)
+            with self._session() as session:
+                result = session.run(query, {"limit": int(limit)})
                 return [record["value"] for record in result]
         except Exception as e:
             logger.warning(f"Could not get property values for {label}.{property_name}: {e}")
@@ -174,11 +287,16 @@ class GraphInterface:
         Returns:
             List of interaction records with severity and details
         """
+        # Each branch anchors on an index seek per supplement name; the
+        # explicit hint keeps the planner from falling back to a label scan
+        # when the anchor predicate is parameterized.
         query = """
         // Check for direct supplement-medication interactions
-        MATCH (s:Supplement)-[i:SUPPLEMENT_INTERACTS_WITH]->(m:Medication)
-        WHERE s.supplement_name IN $supplement_names
-          AND m.medication_name IN $medication_names
+        UNWIND $supplement_names AS supplement_name
+        MATCH (s:Supplement {supplement_name: supplement_name})
+        USING INDEX s:Supplement(supplement_name)
+        MATCH (s)-[i:SUPPLEMENT_INTERACTS_WITH]->(m:Medication)
+        WHERE m.medication_name IN $medication_names
         RETURN 
             s.supplement_name as supplement,
             m.medication_name as medication,
@@ -188,10 +306,12 @@ class GraphInterface:
         UNION
         
         // Check for drug equivalence (supplement contains same drug as medication)
-        MATCH (s:Supplement)-[:CONTAINS]->(a:ActiveIngredient)
+        UNWIND $supplement_names AS supplement_name
+        MATCH (s:Supplement {supplement_name: supplement_name})
+        USING INDEX s:Supplement(supplement_name)
+        MATCH (s)-[:CONTAINS]->(a:ActiveIngredient)
               -[:EQUIVALENT_TO]->(d:Drug)<-[:MEDICATION_CONTAINS_DRUG]-(m:Medication)
-        WHERE s.supplement_name IN $supplement_names
-          AND m.medication_name IN $medication_names
+        WHERE m.medication_name IN $medication_names
         RETURN 
             s.supplement_name as supplement,
             m.medication_name as medication,
@@ -201,10 +321,12 @@ class GraphInterface:
         UNION
         
         // Check for similar pharmacological effects
-        MATCH (s:Supplement)-[:HAS_SIMILAR_EFFECT_TO]->(c:Category)
+        UNWIND $supplement_names AS supplement_name
+        MATCH (s:Supplement {supplement_name: supplement_name})
+        USING INDEX s:Supplement(supplement_name)
+        MATCH (s)-[:HAS_SIMILAR_EFFECT_TO]->(c:Category)
               <-[:BELONGS_TO]-(d:Drug)<-[:MEDICATION_CONTAINS_DRUG]-(m:Medication)
-        WHERE s.supplement_name IN $supplement_names
-          AND m.medication_name IN $medication_names
+        WHERE m.medication_name IN $medication_names
         RETURN 
             s.supplement_name as supplement,
             m.medication_name as medication,
@@ -228,7 +350,7 @@ class GraphInterface:
             True if valid, False otherwise
         """
         try:
-            with self.driver.session() as session:
+            with self._session() as session:
                 session.run(f"EXPLAIN {cypher_query}")
                 return True
         except Exception as e:
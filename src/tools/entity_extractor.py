@@ -10,8 +10,7 @@ Functions:
 - process_patient_profile(): For patient profile sidebar
 """
 
-import os
-from anthropic import Anthropic
+from tools.llm_client import get_anthropic_client
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -41,7 +40,7 @@ def extract_entities_from_text(user_input: str) -> dict:
             "dietary_restrictions": []
         }
     """
-    client = Anthropic(api_key=os.getenv("ANTHROPIC_API_KEY"))
+    client = get_anthropic_client()
     
     prompt = f"""
 You are a medical entity extraction system. Extract structured information from user input.
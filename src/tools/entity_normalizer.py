@@ -16,8 +16,7 @@ Functions:
 - correct_patient_profile_data(): Simple typo correction (no DB context)
 """
 
-import os
-from anthropic import Anthropic
+from tools.llm_client import get_anthropic_client
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -49,7 +48,7 @@ def correct_patient_profile_data(input_name: str) -> str:
         >>> correct_patient_profile_data("blood thinner")
         "blood thinner"
     """
-    client = Anthropic(api_key=os.getenv("ANTHROPIC_API_KEY"))
+    client = get_anthropic_client()
     
     prompt = f"""
 You are a medical spell-checker that corrects typos and expands abbreviations.
@@ -0,0 +1,26 @@
+"""
+LLM Client - Shared Anthropic connection
+
+Every LLM call (entity extraction, name correction, supervisor,
+synthesis) goes through one process-wide Anthropic client, so the HTTP
+connection pool is reused across agents and workflow steps instead of
+being rebuilt per call. The client is thread-safe, which the parallel
+specialists node relies on.
+
+Usage:
+    from tools.llm_client import get_anthropic_client
+
+    client = get_anthropic_client()
+    response = client.messages.create(...)
+"""
+
+import os
+from functools import lru_cache
+
+from anthropic import Anthropic
+
+
+@lru_cache(maxsize=1)
+def get_anthropic_client() -> Anthropic:
+    """Return the shared Anthropic client, creating it on first use."""
+    return Anthropic(api_key=os.getenv("ANTHROPIC_API_KEY"))
@@ -10,17 +10,13 @@ Role: Database runner for agents
 
 Usage:
     from tools.query_executor import QueryExecutor
-    from tools.query_generator import QueryGenerator
+    from tools.query_generator import generate_comprehensive_safety_query
 
     executor = QueryExecutor(graph_interface)
-    gen = QueryGenerator()
 
     # Option A: generate + execute separately
-    q = gen.generate_query('comprehensive_safety', {
-        'supplement_name': 'Fish Oil',
-        'medication_names': ['Warfarin'],
-    })
-    result = executor.execute(q['query'], q['parameters'])
+    q = generate_comprehensive_safety_query('Fish Oil', ['Warfarin'])
+    result = executor.execute(q.query, q.parameters)
 
     # Option B: pass generator output directly
     result = executor.execute_query_dict(q)
@@ -30,10 +26,59 @@ Usage:
     results = run_safety_check(graph_interface, 'Fish Oil', ['Warfarin'])
 """
 
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Hashable, List, Mapping, Optional
+import asyncio
+import threading
 import time
 
 
+# ======================================================================
+# Result cache
+# ======================================================================
+
+class ResultCache:
+    """
+    Small thread-safe TTL cache for agent results.
+
+    The safety and deficiency checks are pure graph lookups, so identical
+    inputs give identical answers until the data is reloaded. Agents key
+    entries on the normalized names they query with and skip Neo4j on a
+    hit. Entries expire after `ttl` seconds; the oldest entry is evicted
+    once `maxsize` is reached.
+    """
+
+    def __init__(self, ttl: float = 600.0, maxsize: int = 256):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._entries: Dict[Hashable, tuple] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value, or None if missing or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store a value; evicts the oldest entry when full."""
+        with self._lock:
+            self._entries.pop(key, None)
+            if len(self._entries) >= self.maxsize:
+                del self._entries[next(iter(self._entries))]
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+
+    def clear(self) -> None:
+        """Drop every entry (e.g. after reloading the graph)."""
+        with self._lock:
+            self._entries.clear()
+
+
 class QueryExecutor:
     """
     Safely executes Cypher queries on Neo4j.
@@ -61,6 +106,7 @@ class QueryExecutor:
         query: str,
         parameters: Optional[Dict] = None,
         retry_count: int = 3,
+        access_mode: Optional[str] = None,
     ) -> Dict[str, Any]:
         """
         Execute a single Cypher query with error handling and retries.
@@ -69,6 +115,8 @@ class QueryExecutor:
             query: Cypher query string
             parameters: Query parameters (safe against injection)
             retry_count: Max retries for transient failures
+            access_mode: Passed to GraphInterface.execute_query ("READ" for
+                generator output)
 
         Returns:
             {
@@ -91,7 +139,7 @@ class QueryExecutor:
         for attempt in range(retry_count):
             try:
                 # GraphInterface.execute_query already returns List[Dict]
-                raw_results = self.graph.execute_query(query, parameters)
+                raw_results = self.graph.execute_query(query, parameters, access_mode=access_mode)
 
                 # Defensive: ensure we always have a list of dicts
                 processed = self._process_results(raw_results)
@@ -149,15 +197,15 @@ class QueryExecutor:
     # Convenience wrappers
     # ------------------------------------------------------------------
 
-    def execute_query_dict(self, query_dict: Dict[str, Any]) -> Dict[str, Any]:
+    def execute_query_dict(self, query_dict: Mapping[str, Any]) -> Dict[str, Any]:
         """
-        Execute a query dict produced by QueryGenerator.generate_query().
+        Execute a query dict (or QueryResult) produced by the query generator.
 
         Args:
             query_dict: {
                 'query': str,
                 'parameters': dict,
-                'explanation': str,
+                'explanation': str,   # may be formatted lazily on first read
                 ...
             }
 
@@ -180,7 +228,7 @@ class QueryExecutor:
                 'parameters': parameters,
             }
 
-        result = self.execute(query, parameters)
+        result = self.execute(query, parameters, access_mode=query_dict.get('access_mode'))
         result['explanation'] = explanation
         result['query_type'] = query_dict.get('query_type', '')
         return result
@@ -457,6 +505,48 @@ def run_safety_check(
     return merged
 
 
+async def execute_safety_queries(
+    async_driver,
+    supplement_name: str,
+    medication_names: List[str],
+    database: Optional[str] = None,
+) -> List[List[Dict[str, Any]]]:
+    """
+    Run the safety pathway queries concurrently on the Neo4j async driver.
+
+    Every pathway gets its own session (a session is not safe for concurrent
+    use), so the server works on all of them at once and the call takes
+    about as long as the slowest pathway instead of their sum. Existing
+    sync callers are unaffected.
+
+    Args:
+        async_driver: A driver from neo4j.AsyncGraphDatabase.driver(...)
+        supplement_name: e.g. "Fish Oil"
+        medication_names: e.g. ["Warfarin", "Aspirin"]
+        database: Optional database name
+
+    Returns:
+        One list of row dicts per pathway (same order as
+        generate_safety_pathways()); queries that failed to generate
+        are skipped. Rows carry a 'pathway' column, so callers can
+        flatten the lists without losing where each row came from.
+    """
+    from tools.query_generator import generate_safety_pathways
+
+    queries = [q for q in generate_safety_pathways(supplement_name, medication_names)
+               if q.get('query')]
+
+    async def _run(query_dict) -> List[Dict[str, Any]]:
+        async with async_driver.session(
+            database=database,
+            default_access_mode=query_dict.get('access_mode', 'WRITE'),
+        ) as session:
+            result = await session.run(query_dict['query'], query_dict['parameters'])
+            return await result.data()
+
+    return list(await asyncio.gather(*(_run(q) for q in queries)))
+
+
 def run_comprehensive_safety(
     graph_interface,
     supplement_name: str,
@@ -583,10 +673,10 @@ if __name__ == "__main__":
 
     # Test 3: QueryGenerator integration
     print("\n--- Test 3: QueryGenerator → Executor integration ---")
-    from tools.query_generator import QueryGenerator
+    from tools.query_generator import QueryGenerator, QueryType
 
     gen = QueryGenerator()
-    q = gen.generate_query('find_supplement', {'name': 'Fish'})
+    q = gen.generate_query(QueryType.SAFETY_CHECK, medications=['Warfarin'], supplements=['Fish Oil'])
     r = executor.execute_query_dict(q)
     print(f"   Explanation: {r.get('explanation')}")
     print(f"   Success: {r['success']}, Count: {r['count']}")
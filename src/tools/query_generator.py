@@ -7,10 +7,309 @@ Schema corrections:
 - DEFICIENT_IN.risk_level (not .severity or .reason)
 """
 
-from enum import Enum
-from typing import List, Dict, Any
+import sys
+import textwrap
+from collections.abc import Mapping
+from dataclasses import dataclass, fields, replace
+from enum import StrEnum
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Final, List, Dict, Any, Iterable, Optional, Tuple, Union
 
-class QueryType(Enum):
+
+# ============================================================================
+# Cypher templates (module-level constants, dedented and stripped once
+# at import; the generators below only pick a template and bind parameters)
+# ============================================================================
+
+# Every value is bound as a $parameter, so each template is a single query
+# string that Neo4j plans once and reuses, and input can't alter the Cypher.
+# Parameters arrive lowercased and names are matched on the indexed
+# *_name_lower copies written by scripts/load_data.py.
+_Q_DIET_DEFICIENCY: Final[str] = textwrap.dedent("""
+    UNWIND $diets AS restriction
+    MATCH (dr:DietaryRestriction {dietary_restriction_name_lower: restriction})
+          -[r:DEFICIENT_IN]->(n:Nutrient)
+    RETURN dr.dietary_restriction_name as diet,
+           n.nutrient_name as nutrient,
+           r.risk_level as risk_level
+""").strip()
+
+_Q_MEDICATION_DEPLETION: Final[str] = textwrap.dedent("""
+    MATCH (m:Medication WHERE m.medication_name_lower IN $meds)
+          -[:MEDICATION_CONTAINS_DRUG]->(d:Drug)-[r:DEPLETES]->(n:Nutrient)
+    RETURN m.medication_name as medication,
+           d.drug_name as drug,
+           n.nutrient_name as nutrient,
+           r.risk_level as risk_level,
+           r.mechanism as mechanism
+""").strip()
+
+# Filters sit inside the node patterns so each branch is pruned at the
+# anchor and returns its final columns directly (no WITH projection).
+_Q_COMBINED_DEFICIENCY: Final[str] = textwrap.dedent("""
+    CALL {
+        // Diet-based deficiencies
+        UNWIND $diets AS restriction
+        MATCH (dr:DietaryRestriction {dietary_restriction_name_lower: restriction})
+              -[r:DEFICIENT_IN]->(n:Nutrient)
+        RETURN n.nutrient_name as nutrient, 'diet' as source,
+               dr.dietary_restriction_name as source_name, r.risk_level as risk_level
+
+        UNION
+
+        // Medication-based depletions
+        MATCH (m:Medication WHERE m.medication_name_lower IN $meds)
+              -[:MEDICATION_CONTAINS_DRUG]->(d:Drug)-[r:DEPLETES]->(n:Nutrient)
+        RETURN n.nutrient_name as nutrient, 'medication' as source,
+               m.medication_name as source_name, r.risk_level as risk_level
+    }
+    RETURN nutrient, source, source_name, risk_level
+    ORDER BY nutrient, source
+""").strip()
+
+_Q_SAFETY_CHECK: Final[str] = textwrap.dedent("""
+    MATCH (s:Supplement)-[r:SUPPLEMENT_INTERACTS_WITH]->(m:Medication)
+    WHERE s.supplement_name_lower IN $supps
+    AND m.medication_name_lower IN $meds
+    RETURN s.supplement_name as supplement,
+           m.medication_name as medication,
+           r.interaction_type as interaction,
+           r.severity as severity,
+           r.description as description
+""").strip()
+
+_Q_RECOMMENDATION_BASE: Final[str] = textwrap.dedent("""
+    MATCH (condition:MedicalCondition)-[:ADDRESSES]-(benefit:BeneficialEffect)-[:PRODUCED_BY]-(s:Supplement)
+    WHERE condition.condition_name_lower = $condition
+    RETURN s.supplement_name as supplement,
+           benefit.benefit_name as benefit,
+           benefit.evidence_strength as evidence_level
+    ORDER BY benefit.evidence_strength DESC
+""").strip()
+_Q_RECOMMENDATION_WITH_LIMIT: Final[str] = _Q_RECOMMENDATION_BASE + "\nLIMIT $limit"
+
+# Safety pathways, one constant each. Every branch runs inside a CALL
+# subquery against an already-bound supplement `s` and medication `m`.
+# Each branch collapses duplicate paths with WITH DISTINCT before
+# projecting, but never limits them: a safety check must return every
+# interaction it finds.
+_PATH_DIRECT_SUPPLEMENT_MEDICATION: Final[str] = textwrap.dedent("""
+    // === PATH 1: Direct Supplement -> Medication interaction ===
+    // Relationship: SUPPLEMENT_INTERACTS_WITH (from load_data line 617)
+    WITH s, m
+    MATCH (s)-[r:SUPPLEMENT_INTERACTS_WITH]->(m)
+    WITH DISTINCT s, m, r
+    RETURN s.supplement_name AS supplement,
+           m.medication_name AS target,
+           r.interaction_description AS description,
+           'MODERATE'         AS severity,
+           null               AS detail,
+           'DIRECT_SUPPLEMENT_MEDICATION' AS pathway
+""").strip()
+
+_PATH_SUPPLEMENT_DRUG_MEDICATION: Final[str] = textwrap.dedent("""
+    // === PATH 2: Supplement -> Drug <- Medication (shared drug interaction) ===
+    // Supplement contains ActiveIngredient equivalent to Drug,
+    // and that Drug INTERACTS_WITH another Drug that the Medication contains
+    WITH s, m
+    MATCH (s)-[:CONTAINS]->(ai:ActiveIngredient)-[:EQUIVALENT_TO]->(d1:Drug)
+          -[r:INTERACTS_WITH]->(d2:Drug)<-[:MEDICATION_CONTAINS_DRUG]-(m)
+    WITH DISTINCT s, m, r, d1, d2
+    RETURN s.supplement_name AS supplement,
+           m.medication_name AS target,
+           r.description     AS description,
+           'HIGH'             AS severity,
+           d1.drug_name + ' interacts with ' + d2.drug_name AS detail,
+           'SUPPLEMENT_DRUG_MEDICATION' AS pathway
+""").strip()
+
+_PATH_HIDDEN_PHARMA_EQUIVALENCE: Final[str] = textwrap.dedent("""
+    // === PATH 3: Hidden pharma equivalence ===
+    // Supplement contains ActiveIngredient equivalent to same Drug that Medication contains
+    WITH s, m
+    MATCH (s)-[:CONTAINS]->(a:ActiveIngredient)
+        -[:EQUIVALENT_TO]->(d:Drug)<-[:MEDICATION_CONTAINS_DRUG]-(m)
+    WITH DISTINCT s, m, a, d
+    RETURN s.supplement_name AS supplement,
+           m.medication_name AS target,
+           'Contains equivalent pharmaceutical ingredient - duplication risk' AS description,
+           'HIGH'             AS severity,
+           a.active_ingredient + ' = ' + d.drug_name AS detail,
+           'HIDDEN_PHARMA_EQUIVALENCE' AS pathway
+""").strip()
+
+_PATH_SIMILAR_EFFECT: Final[str] = textwrap.dedent("""
+    // === PATH 4: Similar pharmacological effect ===
+    // Supplement has similar effect to a Category that a Drug belongs to,
+    // and that Drug is contained in the Medication
+    WITH s, m
+    MATCH (s)-[:HAS_SIMILAR_EFFECT_TO]->(c:Category)
+        <-[:BELONGS_TO]-(d:Drug)<-[:MEDICATION_CONTAINS_DRUG]-(m)
+    WITH DISTINCT s, m, c
+    RETURN s.supplement_name AS supplement,
+           m.medication_name AS target,
+           'Similar pharmacological effect - additive or antagonistic risk' AS description,
+           'MODERATE'         AS severity,
+           c.category         AS detail,
+           'SIMILAR_EFFECT'   AS pathway
+""").strip()
+
+_SAFETY_PATHWAYS: Final[Tuple[str, ...]] = (
+    _PATH_DIRECT_SUPPLEMENT_MEDICATION,
+    _PATH_SUPPLEMENT_DRUG_MEDICATION,
+    _PATH_HIDDEN_PHARMA_EQUIVALENCE,
+    _PATH_SIMILAR_EFFECT,
+)
+
+# The medication list is unwound once and each supplement/medication
+# pair is resolved up front, so the four branches expand from bound
+# nodes instead of each re-filtering both labels with its own IN scan.
+_SAFETY_ANCHOR: Final[str] = textwrap.dedent("""
+    MATCH (s:Supplement)
+    WHERE s.supplement_name_lower = $supplement_name
+    UNWIND $medication_names_lower AS med_lc
+    MATCH (m:Medication)
+    WHERE m.medication_name_lower = med_lc
+""").strip()
+
+_SAFETY_RETURN: Final[str] = "RETURN DISTINCT supplement, target, description, severity, detail, pathway"
+
+
+def _safety_subquery(branches: Iterable[str]) -> str:
+    """Wrap pathway branches in a CALL subquery under the shared anchor."""
+    body = "\n\n    UNION\n\n".join(textwrap.indent(b, "    ") for b in branches)
+    return f"{_SAFETY_ANCHOR}\nCALL {{\n{body}\n}}\n{_SAFETY_RETURN}"
+
+
+_Q_COMPREHENSIVE_SAFETY: Final[str] = _safety_subquery(_SAFETY_PATHWAYS)
+
+# The same pathways as standalone queries, for callers that run them
+# concurrently in separate sessions; keyed by their `pathway` column
+_Q_SAFETY_PATHWAYS: Final[Mapping[str, str]] = MappingProxyType({
+    'direct_supplement_medication': _safety_subquery((_PATH_DIRECT_SUPPLEMENT_MEDICATION,)),
+    'supplement_drug_medication': _safety_subquery((_PATH_SUPPLEMENT_DRUG_MEDICATION,)),
+    'hidden_pharma_equivalence': _safety_subquery((_PATH_HIDDEN_PHARMA_EQUIVALENCE,)),
+    'similar_effect': _safety_subquery((_PATH_SIMILAR_EFFECT,)),
+})
+
+_Q_SUPPLEMENT_INFO: Final[str] = textwrap.dedent("""
+    MATCH (s:Supplement)
+    WHERE s.supplement_name_lower = $supplement
+    OPTIONAL MATCH (s)-[:CONTAINS]->(ai:ActiveIngredient)
+    OPTIONAL MATCH (s)-[:BELONGS_TO]->(cat:Category)
+    RETURN s.supplement_name as supplement,
+           s.description as description,
+           cat.category_name as category,
+           collect(ai.active_ingredient) as active_ingredients
+""").strip()
+
+# One path pattern anchored on the symptom, so the planner expands
+# outward from it instead of joining two independently matched halves
+_Q_SYMPTOM_RECOMMENDATION_BASE: Final[str] = textwrap.dedent("""
+    MATCH (sym:Symptom)-[:CAN_CAUSE]->(condition:MedicalCondition)
+          -[:ADDRESSES]-(benefit:BeneficialEffect)-[:PRODUCED_BY]-(s:Supplement)
+    WHERE sym.symptom_name_lower = $symptom
+    RETURN s.supplement_name as supplement,
+           condition.condition_name as condition,
+           benefit.benefit_name as benefit,
+           benefit.evidence_strength as evidence_level
+    ORDER BY benefit.evidence_strength DESC
+""").strip()
+_Q_SYMPTOM_RECOMMENDATION_WITH_LIMIT: Final[str] = _Q_SYMPTOM_RECOMMENDATION_BASE + "\nLIMIT $limit"
+
+
+# Same value as neo4j.READ_ACCESS; spelled out so this module needs no driver
+READ_ACCESS: Final[str] = "READ"
+
+
+class _LazyStr:
+    """String whose text is only formatted the first time it is read."""
+    
+    __slots__ = ('_fn', '_s')
+    
+    def __init__(self, fn):
+        self._fn = fn
+        self._s = None
+    
+    def __str__(self) -> str:
+        if self._s is None:
+            self._s = self._fn()
+        return self._s
+    
+    def __repr__(self) -> str:
+        return repr(str(self))
+    
+    def __format__(self, spec: str) -> str:
+        return format(str(self), spec)
+
+
+def _norm(name: str) -> str:
+    """
+    Canonical lookup form of one name. Uses str.lower rather than casefold
+    so it agrees with Cypher's toLower(), which produced the stored
+    *_name_lower properties (casefold would turn 'ß' into 'ss' and miss).
+    """
+    return name.strip().lower()
+
+
+def _normalize_names(raw: Union[str, Iterable[str], None]) -> List[str]:
+    """
+    Lowercase names, drop blanks and duplicates, and sort, so the same
+    set of names always binds the same parameter list regardless of the
+    order the user typed them in.
+    """
+    if not raw:
+        return []
+    if isinstance(raw, str):
+        raw = [raw]
+    names = set(map(_norm, filter(None, raw)))
+    names.discard('')
+    return sorted(names)
+
+
+@dataclass(slots=True, frozen=True)
+class QueryResult(Mapping):
+    """
+    Output of every query generator.
+    
+    Fields are read as attributes (result.query). It also behaves like the
+    plain dicts it replaces: result.get('error'), result['parameters'] and
+    dict(result) all work, and fields left as None read as missing keys.
+    A lazily formatted explanation is formatted when read that way.
+    
+    Every generated query is read-only, so access_mode is READ_ACCESS;
+    executors pass it to the driver so clustered deployments can route
+    the query to a follower or read replica.
+    """
+    query: Optional[str] = None
+    parameters: Optional[Mapping[str, Any]] = None
+    explanation: Any = None
+    query_type: Optional[str] = None
+    error: Optional[str] = None
+    access_mode: Optional[str] = None
+    
+    def __getitem__(self, key: str) -> Any:
+        value = getattr(self, key, None) if key in _QUERY_RESULT_KEYS else None
+        if value is None:
+            raise KeyError(key)
+        # The dict view (get, dict(result), executors) hands out a real str,
+        # so it serializes and passes isinstance(..., str)
+        if isinstance(value, _LazyStr):
+            return str(value)
+        return value
+    
+    def __iter__(self):
+        return (key for key in _QUERY_RESULT_KEYS if getattr(self, key) is not None)
+    
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+
+_QUERY_RESULT_KEYS = tuple(f.name for f in fields(QueryResult))
+
+
+class QueryType(StrEnum):
     SAFETY_CHECK = "safety_check"
     DEFICIENCY_CHECK = "deficiency_check"
     RECOMMENDATION = "recommendation"
@@ -18,132 +317,269 @@ class QueryType(Enum):
     MEDICATION_DEPLETION = "medication_depletion"
     COMBINED_DEFICIENCY = "combined_deficiency"
 
+# ============================================================================
+# Parameter models (validated and normalized once per generate_query call)
+# ============================================================================
+
+@dataclass(slots=True)
+class DietDeficiencyParams:
+    dietary_restrictions: List[str]
+    
+    def __post_init__(self):
+        self.dietary_restrictions = _normalize_names(self.dietary_restrictions)
+    
+    def missing(self) -> Optional[str]:
+        return None if self.dietary_restrictions else 'Missing dietary_restrictions'
+
+
+@dataclass(slots=True)
+class MedicationDepletionParams:
+    medications: List[str]
+    
+    def __post_init__(self):
+        self.medications = _normalize_names(self.medications)
+    
+    def missing(self) -> Optional[str]:
+        return None if self.medications else 'Missing medications'
+
+
+@dataclass(slots=True)
+class CombinedDeficiencyParams:
+    dietary_restrictions: List[str]
+    medications: List[str]
+    
+    def __post_init__(self):
+        self.dietary_restrictions = _normalize_names(self.dietary_restrictions)
+        self.medications = _normalize_names(self.medications)
+    
+    def missing(self) -> Optional[str]:
+        # Either source alone still yields rows
+        if self.dietary_restrictions or self.medications:
+            return None
+        return 'Missing dietary_restrictions and medications'
+
+
+@dataclass(slots=True)
+class SafetyCheckParams:
+    medications: List[str]
+    supplements: List[str]
+    
+    def __post_init__(self):
+        self.medications = _normalize_names(self.medications)
+        self.supplements = _normalize_names(self.supplements)
+    
+    def missing(self) -> Optional[str]:
+        # An interaction needs both sides
+        if self.medications and self.supplements:
+            return None
+        return 'Missing medications or supplements'
+
+
+@dataclass(slots=True)
+class RecommendationParams:
+    health_condition: str
+    limit: Optional[int] = 20
+    
+    def __post_init__(self):
+        # None (nothing extracted) reads as missing; see missing()
+        if self.health_condition is None:
+            self.health_condition = ''
+        elif not isinstance(self.health_condition, str):
+            raise TypeError(
+                f"health_condition must be a str, not {type(self.health_condition).__name__}"
+            )
+        self.health_condition = _norm(self.health_condition)
+        if self.limit is not None:
+            self.limit = int(self.limit)
+    
+    def missing(self) -> Optional[str]:
+        return None if self.health_condition else 'Missing health_condition'
+
+
 class QueryGenerator:
     """Generates Neo4j Cypher queries for the supplement safety system."""
     
-    def generate_query(self, query_type: QueryType, **kwargs) -> str:
-        """Generate a Neo4j Cypher query based on the query type and parameters."""
+    def generate_query(self, query_type: Union[QueryType, str], **kwargs) -> QueryResult:
+        """
+        Generate a Neo4j Cypher query based on the query type and parameters.
         
-        if query_type == QueryType.SAFETY_CHECK:
-            return self._safety_check_query(**kwargs)
-        elif query_type == QueryType.DEFICIENCY_CHECK:
-            return self._deficiency_check_query(**kwargs)
-        elif query_type == QueryType.RECOMMENDATION:
-            return self._recommendation_query(**kwargs)
-        elif query_type == QueryType.DIET_DEFICIENCY:
-            return self._diet_deficiency(**kwargs)
-        elif query_type == QueryType.MEDICATION_DEPLETION:
-            return self._medication_depletion(**kwargs)
-        elif query_type == QueryType.COMBINED_DEFICIENCY:
-            return self._combined_deficiency(**kwargs)
-        else:
+        query_type may be a QueryType member or its plain string value (the
+        members are strings, so both hit the same dispatch/cache entries).
+        Keyword arguments are parsed into the query type's parameter model,
+        so a missing or unexpected argument raises TypeError up front. If
+        the names normalize to nothing, the result carries an error and no
+        query, so executors skip the database.
+        """
+        if query_type not in _VALID_TYPES:
             raise ValueError(f"Unknown query type: {query_type}")
+        key = query_type
+        
+        # Identical (type, params) pairs come up repeatedly across agents in
+        # one conversation; serve them from the cache when the args are hashable
+        frozen_params = tuple(sorted((k, _freeze(v)) for k, v in kwargs.items()))
+        try:
+            hash(frozen_params)
+        except TypeError:
+            return _build_query(key, kwargs)
+        return _fresh(_cached_generate(key, frozen_params))
     
-    def _diet_deficiency(self, dietary_restrictions: List[str]) -> str:
-        """Generate query for diet-based nutrient deficiencies."""
-        restrictions_str = ", ".join([f"'{r.lower()}'" for r in dietary_restrictions])
-        return f"""
-        MATCH (dr:DietaryRestriction)-[r:DEFICIENT_IN]->(n:Nutrient)
-        WHERE toLower(dr.dietary_restriction_name) IN [{restrictions_str}]
-        RETURN dr.dietary_restriction_name as diet,
-               n.nutrient_name as nutrient,
-               r.risk_level as risk_level
+    def generate_query_paged(
+        self,
+        query_type: Union[QueryType, str],
+        page: int = 0,
+        page_size: int = 25,
+        **kwargs
+    ) -> QueryResult:
+        """
+        Generate one page of an ordered query.
+        
+        Appends SKIP $skip LIMIT $limit to the query so that, together with
+        its ORDER BY, Neo4j only has to sort skip + limit rows. Only query
+        types with a stable ORDER BY can be paged.
         """
+        if query_type not in _PAGEABLE_TYPES:
+            raise ValueError(f"Query type cannot be paged: {query_type}")
+        if query_type == QueryType.RECOMMENDATION:
+            kwargs['limit'] = None
+        
+        base = self.generate_query(query_type, **kwargs)
+        if base.error:
+            return base
+        return QueryResult(
+            query=base.query + "\nSKIP $skip LIMIT $limit",
+            parameters={**base.parameters, 'skip': max(page, 0) * page_size, 'limit': page_size},
+            explanation=base.explanation,
+            query_type=base.query_type,
+            access_mode=base.access_mode
+        )
+    
+    @staticmethod
+    def _diet_deficiency(p: DietDeficiencyParams) -> Tuple[str, Dict[str, Any]]:
+        """Generate query for diet-based nutrient deficiencies."""
+        return _Q_DIET_DEFICIENCY, {'diets': p.dietary_restrictions}
     
-    def _medication_depletion(self, medications: List[str]) -> str:
+    @staticmethod
+    def _medication_depletion(p: MedicationDepletionParams) -> Tuple[str, Dict[str, Any]]:
         """Generate query for medication-induced nutrient depletion."""
-        medications_str = ", ".join([f"'{med.lower()}'" for med in medications])
-        return f"""
-        MATCH (m:Medication)-[:MEDICATION_CONTAINS_DRUG]->(d:Drug)-[r:DEPLETES]->(n:Nutrient)
-        WHERE toLower(m.medication_name) IN [{medications_str}]
-        RETURN m.medication_name as medication,
-               d.drug_name as drug,
-               n.nutrient_name as nutrient,
-               r.risk_level as risk_level,
-               r.mechanism as mechanism
-        """
+        return _Q_MEDICATION_DEPLETION, {'meds': p.medications}
     
-    def _combined_deficiency(self, dietary_restrictions: List[str], medications: List[str]) -> str:
+    @staticmethod
+    def _combined_deficiency(p: CombinedDeficiencyParams) -> Tuple[str, Dict[str, Any]]:
         """Generate query for combined diet and medication deficiency risks."""
-        restrictions_str = ", ".join([f"'{r.lower()}'" for r in dietary_restrictions])
-        medications_str = ", ".join([f"'{med.lower()}'" for med in medications])
-        
-        return f"""
-        // Diet-based deficiencies
-        MATCH (dr:DietaryRestriction)-[r1:DEFICIENT_IN]->(n:Nutrient)
-        WHERE toLower(dr.dietary_restriction_name) IN [{restrictions_str}]
-        WITH n.nutrient_name as nutrient, 'diet' as source, dr.dietary_restriction_name as diet_name, r1.risk_level as risk_level
-        
-        UNION
-        
-        // Medication-based depletions
-        MATCH (m:Medication)-[:MEDICATION_CONTAINS_DRUG]->(d:Drug)-[r2:DEPLETES]->(n:Nutrient)
-        WHERE toLower(m.medication_name) IN [{medications_str}]
-        WITH n.nutrient_name as nutrient, 'medication' as source, m.medication_name as med_name, r2.risk_level as risk_level
-        
-        RETURN nutrient, source, 
-               CASE WHEN source = 'diet' THEN diet_name ELSE med_name END as source_name,
-               risk_level
-        ORDER BY nutrient, source
-        """
+        return _Q_COMBINED_DEFICIENCY, {'diets': p.dietary_restrictions, 'meds': p.medications}
     
-    def _safety_check_query(self, medications: List[str], supplements: List[str]) -> str:
+    @staticmethod
+    def _safety_check_query(p: SafetyCheckParams) -> Tuple[str, Dict[str, Any]]:
         """Generate safety check query for supplement-medication interactions."""
-        medications_str = ", ".join([f"'{med.lower()}'" for med in medications])
-        supplements_str = ", ".join([f"'{supp.lower()}'" for supp in supplements])
-        
-        return f"""
-        MATCH (s:Supplement)-[r:SUPPLEMENT_INTERACTS_WITH]->(m:Medication)
-        WHERE toLower(s.supplement_name) IN [{supplements_str}]
-        AND toLower(m.medication_name) IN [{medications_str}]
-        RETURN s.supplement_name as supplement,
-               m.medication_name as medication,
-               r.interaction_type as interaction,
-               r.severity as severity,
-               r.description as description
-        """
+        return _Q_SAFETY_CHECK, {'supps': p.supplements, 'meds': p.medications}
     
-    def _deficiency_check_query(self, dietary_restrictions: List[str]) -> str:
+    @staticmethod
+    def _deficiency_check_query(p: DietDeficiencyParams) -> Tuple[str, Dict[str, Any]]:
         """Generate deficiency check query - wrapper for diet_deficiency."""
-        return self._diet_deficiency(dietary_restrictions)
+        return QueryGenerator._diet_deficiency(p)
     
-    def _recommendation_query(self, health_condition: str) -> str:
+    @staticmethod
+    def _recommendation_query(p: RecommendationParams) -> Tuple[str, Dict[str, Any]]:
         """Generate recommendation query for supplements that help with a health condition."""
-        return f"""
-        MATCH (condition:MedicalCondition)-[:ADDRESSES]-(benefit:BeneficialEffect)-[:PRODUCED_BY]-(s:Supplement)
-        WHERE toLower(condition.condition_name) = toLower('{health_condition}')
-        RETURN s.supplement_name as supplement,
-               benefit.benefit_name as benefit,
-               benefit.evidence_strength as evidence_level
-        ORDER BY benefit.evidence_strength DESC
-        """
+        if p.limit is None:
+            return _Q_RECOMMENDATION_BASE, {'condition': p.health_condition}
+        return _Q_RECOMMENDATION_WITH_LIMIT, {'condition': p.health_condition, 'limit': p.limit}
+
+# Read-only dispatch table: query type value -> (parameter model, builder)
+_DISPATCH = MappingProxyType({
+    sys.intern(QueryType.SAFETY_CHECK.value): (SafetyCheckParams, QueryGenerator._safety_check_query),
+    sys.intern(QueryType.DEFICIENCY_CHECK.value): (DietDeficiencyParams, QueryGenerator._deficiency_check_query),
+    sys.intern(QueryType.RECOMMENDATION.value): (RecommendationParams, QueryGenerator._recommendation_query),
+    sys.intern(QueryType.DIET_DEFICIENCY.value): (DietDeficiencyParams, QueryGenerator._diet_deficiency),
+    sys.intern(QueryType.MEDICATION_DEPLETION.value): (MedicationDepletionParams, QueryGenerator._medication_depletion),
+    sys.intern(QueryType.COMBINED_DEFICIENCY.value): (CombinedDeficiencyParams, QueryGenerator._combined_deficiency),
+})
+
+_VALID_TYPES = frozenset(_DISPATCH)
+_PAGEABLE_TYPES = frozenset({QueryType.RECOMMENDATION, QueryType.COMBINED_DEFICIENCY})
+
+def _freeze(value: Any) -> Any:
+    """Make list-like arguments hashable for use in a cache key."""
+    if isinstance(value, (list, tuple, set, frozenset)):
+        # Every list argument is a list of names, so normalizing here lets
+        # reordered or re-cased inputs share one cache entry
+        if all(isinstance(v, str) for v in value):
+            return tuple(_normalize_names(value))
+        return tuple(value)
+    return value
+
+
+def _build_query(key: str, kwargs: Dict[str, Any]) -> QueryResult:
+    model_cls, build = _DISPATCH[key]
+    params = model_cls(**kwargs)
+    # Nothing to match (e.g. every name was blank): answer without a
+    # database round trip for a guaranteed-empty result
+    error = params.missing()
+    if error:
+        return QueryResult(error=error, query_type=key)
+    query, parameters = build(params)
+    return QueryResult(query=query, parameters=parameters, query_type=key,
+                       access_mode=READ_ACCESS)
+
+
+@lru_cache(maxsize=256)
+def _cached_generate(key: str, frozen_params: tuple) -> QueryResult:
+    kwargs = {k: list(v) if isinstance(v, tuple) else v for k, v in frozen_params}
+    result = _build_query(key, kwargs)
+    if result.parameters is None:
+        return result
+    return replace(result, parameters=_read_only(result.parameters))
+
+
+def _read_only(parameters: Mapping[str, Any]) -> Mapping[str, Any]:
+    """Read-only view of query parameters, list values frozen to tuples."""
+    return MappingProxyType({
+        k: tuple(v) if isinstance(v, list) else v for k, v in parameters.items()
+    })
+
+
+def _fresh(result: QueryResult) -> QueryResult:
+    """
+    Copy of a cached result with its own parameters dict.
+    
+    Cached results are shared by every caller, so they hold parameters as a
+    read-only mapping; callers get a plain dict (with fresh lists) they are
+    free to modify.
+    """
+    if result.parameters is None:
+        return result
+    return replace(result, parameters={
+        k: list(v) if isinstance(v, tuple) else v
+        for k, v in result.parameters.items()
+    })
+
+
+# QueryGenerator holds no state, so one shared instance serves every caller
+_GENERATOR: Final[QueryGenerator] = QueryGenerator()
+
 
 # Convenience functions for common query patterns
-def generate_diet_deficiency_query(dietary_restrictions: List[str]) -> str:
+def generate_diet_deficiency_query(dietary_restrictions: List[str]) -> QueryResult:
     """Convenience function to generate diet deficiency query."""
-    generator = QueryGenerator()
-    return generator.generate_query(QueryType.DIET_DEFICIENCY, dietary_restrictions=dietary_restrictions)
+    return _GENERATOR.generate_query(QueryType.DIET_DEFICIENCY, dietary_restrictions=dietary_restrictions)
 
-def generate_medication_depletion_query(medications: List[str]) -> str:
+def generate_medication_depletion_query(medications: List[str]) -> QueryResult:
     """Convenience function to generate medication depletion query."""
-    generator = QueryGenerator()
-    return generator.generate_query(QueryType.MEDICATION_DEPLETION, medications=medications)
+    return _GENERATOR.generate_query(QueryType.MEDICATION_DEPLETION, medications=medications)
 
-def generate_combined_deficiency_query(dietary_restrictions: List[str], medications: List[str]) -> str:
+def generate_combined_deficiency_query(dietary_restrictions: List[str], medications: List[str]) -> QueryResult:
     """Convenience function to generate combined deficiency query."""
-    generator = QueryGenerator()
-    return generator.generate_query(QueryType.COMBINED_DEFICIENCY, 
-                                   dietary_restrictions=dietary_restrictions, 
-                                   medications=medications)
+    return _GENERATOR.generate_query(QueryType.COMBINED_DEFICIENCY, 
+                                     dietary_restrictions=dietary_restrictions, 
+                                     medications=medications)
 
-def generate_safety_check_query(medications: List[str], supplements: List[str]) -> str:
+def generate_safety_check_query(medications: List[str], supplements: List[str]) -> QueryResult:
     """Convenience function to generate safety check query."""
-    generator = QueryGenerator()
-    return generator.generate_query(QueryType.SAFETY_CHECK, 
-                                   medications=medications, 
-                                   supplements=supplements)
+    return _GENERATOR.generate_query(QueryType.SAFETY_CHECK, 
+                                     medications=medications, 
+                                     supplements=supplements)
 
-def generate_comprehensive_safety_query(supplement_name: str, medication_names: List[str]) -> Dict[str, Any]:
+def generate_comprehensive_safety_query(supplement_name: str, medication_names: List[str]) -> QueryResult:
     """
     Generate a comprehensive safety query that checks ALL interaction pathways:
     1. Direct Supplement → Medication interactions
@@ -156,133 +592,150 @@ def generate_comprehensive_safety_query(supplement_name: str, medication_names:
         medication_names: List of medications to check against
         
     Returns:
-        Dict with 'query', 'parameters', and optionally 'error' keys
+        QueryResult with 'query', 'parameters', and optionally 'error' keys
     """
-    if not supplement_name or not medication_names:
-        return {'error': 'Missing supplement_name or medication_names'}
+    # Convert to lowercase for case-insensitive matching; duplicate
+    # medications would only multiply identical rows in every pathway
+    medications_lower = _normalize_names(medication_names)
     
-    # Convert to lowercase for case-insensitive matching
-    supplement_lower = supplement_name.lower()
-    medications_lower = [med.lower() for med in medication_names]
+    if not supplement_name or not medications_lower:
+        return QueryResult(error='Missing supplement_name or medication_names')
     
-    query = """
-    // === PATH 1: Direct Supplement -> Medication interaction ===
-    // Relationship: SUPPLEMENT_INTERACTS_WITH (from load_data line 617)
-    MATCH (s:Supplement)-[r:SUPPLEMENT_INTERACTS_WITH]->(m:Medication)
-    WHERE toLower(s.supplement_name) = toLower($supplement_name)
-        AND toLower(m.medication_name) IN $medication_names_lower
-    RETURN s.supplement_name AS supplement,
-           m.medication_name AS target,
-           r.interaction_description AS description,
-           'MODERATE'         AS severity,
-           null               AS detail,
-           'DIRECT_SUPPLEMENT_MEDICATION' AS pathway
-
-    UNION
-
-    // === PATH 2: Supplement -> Drug <- Medication (shared drug interaction) ===
-    // Supplement contains ActiveIngredient equivalent to Drug,
-    // and that Drug INTERACTS_WITH another Drug that the Medication contains
-    MATCH (s:Supplement)-[:CONTAINS]->(ai:ActiveIngredient)-[:EQUIVALENT_TO]->(d1:Drug)
-          -[r:INTERACTS_WITH]->(d2:Drug)<-[:MEDICATION_CONTAINS_DRUG]-(m:Medication)
-    WHERE toLower(s.supplement_name) = toLower($supplement_name)
-        AND toLower(m.medication_name) IN $medication_names_lower
-    RETURN s.supplement_name AS supplement,
-           m.medication_name AS target,
-           r.description     AS description,
-           'HIGH'             AS severity,
-           d1.drug_name + ' interacts with ' + d2.drug_name AS detail,
-           'SUPPLEMENT_DRUG_MEDICATION' AS pathway
-
-    UNION
-
-    // === PATH 3: Hidden pharma equivalence ===
-    // Supplement contains ActiveIngredient equivalent to same Drug that Medication contains
-    MATCH (s:Supplement)-[:CONTAINS]->(a:ActiveIngredient)
-        -[:EQUIVALENT_TO]->(d:Drug)<-[:MEDICATION_CONTAINS_DRUG]-(m:Medication)
-    WHERE toLower(s.supplement_name) = toLower($supplement_name)
-        AND toLower(m.medication_name) IN $medication_names_lower
-    RETURN s.supplement_name AS supplement,
-           m.medication_name AS target,
-           'Contains equivalent pharmaceutical ingredient - duplication risk' AS description,
-           'HIGH'             AS severity,
-           a.active_ingredient + ' = ' + d.drug_name AS detail,
-           'HIDDEN_PHARMA_EQUIVALENCE' AS pathway
+    return _fresh(_build_comprehensive_safety(
+        _norm(supplement_name), tuple(medications_lower)
+    ))
 
-    UNION
+# Memoized on the normalized inputs, so a repeated question skips the
+# lowercasing and query setup. The cached result is shared, so its
+# parameters are read-only; the public wrappers hand out a copy (_fresh).
+@lru_cache(maxsize=512)
+def _build_comprehensive_safety(supplement_lower: str, meds_key: Tuple[str, ...]) -> QueryResult:
+    return QueryResult(
+        query=_Q_COMPREHENSIVE_SAFETY,
+        parameters=_read_only({
+            'supplement_name': supplement_lower,
+            'medication_names_lower': meds_key
+        }),
+        explanation=_LazyStr(
+            lambda: f"Checking all interaction pathways between {supplement_lower} "
+                    f"and {len(meds_key)} medication(s)"
+        ),
+        query_type='comprehensive_safety',
+        access_mode=READ_ACCESS
+    )
 
-    // === PATH 4: Similar pharmacological effect ===
-    // Supplement has similar effect to a Category that a Drug belongs to,
-    // and that Drug is contained in the Medication
-    MATCH (s:Supplement)-[:HAS_SIMILAR_EFFECT_TO]->(c:Category)
-        <-[:BELONGS_TO]-(d:Drug)<-[:MEDICATION_CONTAINS_DRUG]-(m:Medication)
-    WHERE toLower(s.supplement_name) = toLower($supplement_name)
-        AND toLower(m.medication_name) IN $medication_names_lower
-    RETURN s.supplement_name AS supplement,
-           m.medication_name AS target,
-           'Similar pharmacological effect - additive or antagonistic risk' AS description,
-           'MODERATE'         AS severity,
-           c.category         AS detail,
-           'SIMILAR_EFFECT'   AS pathway
+def generate_safety_pathways(supplement_name: str, medication_names: List[str]) -> List[QueryResult]:
     """
+    Generate one query per interaction pathway (same rows as the
+    comprehensive query, split so they can run concurrently).
     
-    return {
-        'query': query,
-        'parameters': {
-            'supplement_name': supplement_lower,
-            'medication_names_lower': medications_lower
-        }
-    }
+    Returns:
+        List of QueryResult, one per pathway, or a single error result
+    """
+    medications_lower = _normalize_names(medication_names)
+    
+    if not supplement_name or not medications_lower:
+        return [QueryResult(error='Missing supplement_name or medication_names')]
+    
+    return [_fresh(result) for result in _build_safety_pathways(
+        _norm(supplement_name), tuple(medications_lower)
+    )]
 
-def generate_safety_queries(supplement_name: str, medication_names: List[str]) -> List[Dict[str, Any]]:
+@lru_cache(maxsize=512)
+def _build_safety_pathways(supplement_lower: str, meds_key: Tuple[str, ...]) -> Tuple[QueryResult, ...]:
+    return tuple(
+        QueryResult(
+            query=query,
+            parameters=_read_only({
+                'supplement_name': supplement_lower,
+                'medication_names_lower': meds_key
+            }),
+            explanation=_LazyStr(
+                lambda pathway=pathway: f"Checking {pathway} interactions between "
+                                        f"{supplement_lower} and {len(meds_key)} medication(s)"
+            ),
+            query_type=pathway,
+            access_mode=READ_ACCESS
+        )
+        for pathway, query in _Q_SAFETY_PATHWAYS.items()
+    )
+
+def generate_safety_queries(supplement_name: str, medication_names: List[str]) -> List[QueryResult]:
     """
     Generate multiple safety check queries (backwards compatibility).
-    Returns a list of query dictionaries.
+    Returns a list of QueryResult objects.
+    
+    This is the single comprehensive query, so sync callers running the
+    list one by one make one round trip; use generate_safety_pathways()
+    to fan the pathways out concurrently.
     """
     return [generate_comprehensive_safety_query(supplement_name, medication_names)]
 
-def generate_supplement_info_query(supplement_name: str) -> Dict[str, Any]:
+def generate_supplement_info_query(supplement_name: str) -> QueryResult:
     """
     Generate query to get detailed information about a supplement.
     """
     if not supplement_name:
-        return {'error': 'Missing supplement_name'}
-    
-    query = """
-    MATCH (s:Supplement)
-    WHERE toLower(s.supplement_name) = toLower($supplement)
-    OPTIONAL MATCH (s)-[:CONTAINS]->(ai:ActiveIngredient)
-    OPTIONAL MATCH (s)-[:BELONGS_TO]->(cat:Category)
-    RETURN s.supplement_name as supplement,
-           s.description as description,
-           cat.category_name as category,
-           collect(ai.active_ingredient) as active_ingredients
-    """
+        return QueryResult(error='Missing supplement_name')
     
-    return {
-        'query': query,
-        'parameters': {'supplement': supplement_name.lower()}
-    }
+    return _fresh(_build_supplement_info(_norm(supplement_name)))
+
+@lru_cache(maxsize=512)
+def _build_supplement_info(supplement_lower: str) -> QueryResult:
+    return QueryResult(
+        query=_Q_SUPPLEMENT_INFO,
+        parameters=_read_only({'supplement': supplement_lower}),
+        explanation=_LazyStr(lambda: f"Looking up details for supplement {supplement_lower}"),
+        query_type='supplement_info',
+        access_mode=READ_ACCESS
+    )
 
-def generate_symptom_recommendation_query(symptom: str) -> Dict[str, Any]:
+def generate_symptom_recommendation_query(symptom: str, limit: Optional[int] = 20) -> QueryResult:
     """
     Generate query to find supplements that may help with a symptom.
+    
+    Only the top `limit` rows (by evidence strength) are returned;
+    pass limit=None for every match.
     """
     if not symptom:
-        return {'error': 'Missing symptom'}
+        return QueryResult(error='Missing symptom')
     
-    query = """
-    MATCH (sym:Symptom)-[:CAN_CAUSE]->(condition:MedicalCondition)
-    MATCH (condition)-[:ADDRESSES]-(benefit:BeneficialEffect)-[:PRODUCED_BY]-(s:Supplement)
-    WHERE toLower(sym.symptom_name) = toLower($symptom)
-    RETURN s.supplement_name as supplement,
-           condition.condition_name as condition,
-           benefit.benefit_name as benefit,
-           benefit.evidence_strength as evidence_level
-    ORDER BY benefit.evidence_strength DESC
-    """
+    return _fresh(_build_symptom_recommendation(
+        _norm(symptom), None if limit is None else int(limit)
+    ))
+
+@lru_cache(maxsize=512)
+def _build_symptom_recommendation(symptom_lower: str, limit: Optional[int]) -> QueryResult:
+    parameters = {'symptom': symptom_lower}
+    if limit is None:
+        query = _Q_SYMPTOM_RECOMMENDATION_BASE
+    else:
+        query = _Q_SYMPTOM_RECOMMENDATION_WITH_LIMIT
+        parameters['limit'] = limit
     
-    return {
-        'query': query,
-        'parameters': {'symptom': symptom.lower()}
-    }
+    return QueryResult(
+        query=query,
+        parameters=_read_only(parameters),
+        explanation=_LazyStr(lambda: f"Finding supplements for symptom '{symptom_lower}'"),
+        query_type='symptom_recommendation',
+        access_mode=READ_ACCESS
+    )
+
+def generate_warmup_queries() -> List[Tuple[str, Dict[str, Any]]]:
+    """
+    Every template paired with throwaway parameters, for priming Neo4j's
+    plan cache at startup (see GraphInterface.warm_up). The parameter
+    names match what the generators bind, so the cached plans are the
+    ones real requests hit.
+    """
+    name, names = '__warmup__', ['__warmup__']
+    return [
+        (_Q_DIET_DEFICIENCY, {'diets': names}),
+        (_Q_MEDICATION_DEPLETION, {'meds': names}),
+        (_Q_COMBINED_DEFICIENCY, {'diets': names, 'meds': names}),
+        (_Q_SAFETY_CHECK, {'supps': names, 'meds': names}),
+        (_Q_RECOMMENDATION_WITH_LIMIT, {'condition': name, 'limit': 1}),
+        (_Q_COMPREHENSIVE_SAFETY, {'supplement_name': name, 'medication_names_lower': names}),
+        (_Q_SUPPLEMENT_INFO, {'supplement': name}),
+        (_Q_SYMPTOM_RECOMMENDATION_WITH_LIMIT, {'symptom': name, 'limit': 1}),
+    ]
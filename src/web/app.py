@@ -3,21 +3,18 @@ Supplement Safety Advisor - Streamlit App
 Personalized supplement recommendations using knowledge graphs
 """
 import os
+import re
 import sys
+from collections import deque
+from functools import lru_cache
+from itertools import islice
 from pathlib import Path
 
 import streamlit as st
-from dotenv import load_dotenv
 
 project_root = Path(__file__).parent.parent  # points to src/
 sys.path.insert(0, str(project_root))
 
-from workflow.graph_builder import build_workflow, run_workflow
-from graph.graph_interface import GraphInterface
-
-# Load environment
-load_dotenv()
-
 # Page config
 st.set_page_config(
     page_title="Supplement Safety Advisor",
@@ -32,7 +29,21 @@ st.set_page_config(
 
 @st.cache_resource
 def initialize_system():
-    """Initialize the knowledge graph and workflow agent."""
+    """
+    Initialize the knowledge graph and workflow agent.
+
+    The heavy imports (Neo4j driver, LangGraph, agents) live here rather
+    than at module top, so the title paints before they load; the
+    cache_resource decorator means they only load once per process.
+    """
+    from dotenv import load_dotenv
+    from graph.graph_interface import GraphInterface
+    from tools.query_generator import generate_warmup_queries
+    from workflow.graph_builder import build_workflow
+
+    # Load environment
+    load_dotenv()
+
     neo4j_uri = os.getenv("NEO4J_URI", "bolt://localhost:7687")
     neo4j_user = os.getenv("NEO4J_USER", "neo4j")
     neo4j_password = os.getenv("NEO4J_PASSWORD")
@@ -44,7 +55,17 @@ def initialize_system():
         st.stop()
 
     try:
-        graph = GraphInterface(neo4j_uri, neo4j_user, neo4j_password)
+        graph = GraphInterface(
+            neo4j_uri, neo4j_user, neo4j_password,
+            database=os.getenv("NEO4J_DATABASE", "neo4j"),
+            max_connection_pool_size=int(os.getenv("NEO4J_MAX_CONNECTION_POOL_SIZE", "100")),
+        )
+        # Refuse to start on a graph without the lowercase lookup
+        # properties, where safety checks would silently match nothing
+        graph.check_lowercase_lookups()
+        # Runs once per process (cache_resource), so the first user
+        # question doesn't pay for cold indexes and plan compilation
+        graph.warm_up(generate_warmup_queries())
         workflow = build_workflow()
         return workflow, graph
     except Exception as e:
@@ -52,10 +73,94 @@ def initialize_system():
         st.stop()
 
 
+# Each count is its own subquery, so the planner can answer it from the
+# label count store instead of streaming through the previous count
+STATS_QUERY = """
+CALL { MATCH (s:Supplement) RETURN count(s) AS supplements }
+CALL { MATCH (m:Medication) RETURN count(m) AS medications }
+CALL { MATCH (d:Drug) RETURN count(d) AS drugs }
+RETURN supplements, medications, drugs
+"""
+
+
+@st.cache_data(ttl=300, show_spinner=False)
+def fetch_db_stats(_graph) -> dict:
+    """Sidebar node counts, cached so widget reruns don't requery."""
+    stats = _graph.execute_query(STATS_QUERY)
+    return stats[0] if stats else {}
+
+
+@st.fragment(run_every=300)
+def render_db_stats(graph):
+    """
+    Sidebar "Database Info" panel. As a fragment it refreshes on its own
+    timer (matching the stats cache TTL), and those timed reruns redraw
+    only this panel rather than the whole page.
+    """
+    with st.expander("📊 Database Info"):
+        try:
+            stats = fetch_db_stats(graph)
+            if stats:
+                st.metric("Supplements", stats['supplements'])
+                st.metric("Medications", stats['medications'])
+                st.metric("Drugs (DrugBank)", stats['drugs'])
+        except Exception:
+            st.caption("Stats unavailable")
+
+
 # ======================================================================
 # State → Display translation
 # ======================================================================
 
+# State flag → question type, checked in order; first set flag wins
+_TYPE_BY_FLAG = (
+    ('recommendations_checked', 'recommendations'),
+    ('safety_checked', 'safety'),
+    ('deficiency_checked', 'deficiency'),
+)
+
+# Rows shown in the debug panel's raw results
+RAW_RESULTS_SHOWN = 10
+
+# Interaction columns the debug panel shows; the rest stay out of the
+# display dict (and so out of st.json and session state)
+INTERACTION_DISPLAY_FIELDS = ('supplement', 'target', 'severity', 'description', 'pathway')
+
+# Questions kept in session history, and how many the page lists
+CHAT_HISTORY_SIZE = 20
+HISTORY_SHOWN = 3
+
+# History icon by question type ('warning' overrides the type)
+_HISTORY_ICONS = {
+    'warning': "⚠️",
+    'comparison': "⚖️",
+    'recommendation': "💡",
+    'recommendations': "💡",
+}
+
+class UncachedAnswer(Exception):
+    """
+    Raised out of answer_question for a degraded run (workflow error or a
+    failed graph query) so st.cache_data doesn't keep it; carries the
+    translated result so the page can still show it.
+    """
+
+    def __init__(self, result: dict):
+        super().__init__(result.get('error') or 'Degraded answer')
+        self.result = result
+
+
+def is_degraded(state: dict) -> bool:
+    """True if the run hit an error or any graph query failed or was skipped."""
+    if state.get('error_message'):
+        return True
+    if any(not q.get('success', True) for q in state.get('query_history') or ()):
+        return True
+    # A supplement whose safety query couldn't be generated leaves no entry
+    safety = state.get('safety_results') or {}
+    return len(safety.get('queries_run', ())) < len(safety.get('supplements_checked', ()))
+
+
 def translate_result(state: dict) -> dict:
     """
     Translate raw LangGraph state into the flat dict that the UI expects.
@@ -72,14 +177,7 @@ def translate_result(state: dict) -> dict:
     answer = state.get('final_answer') or state.get('error_message') or 'No answer generated.'
 
     # --- question type ---
-    if state.get('recommendations_checked'):
-        q_type = 'recommendations'
-    elif state.get('safety_checked'):
-        q_type = 'safety'
-    elif state.get('deficiency_checked'):
-        q_type = 'deficiency'
-    else:
-        q_type = 'general'
+    q_type = next((name for flag, name in _TYPE_BY_FLAG if state.get(flag)), 'general')
 
     # --- entities ---
     entities = state.get('extracted_entities') or {}
@@ -89,38 +187,50 @@ def translate_result(state: dict) -> dict:
     results_count = 0
     raw_results = None
 
+    safety, recommendations, deficiency = (
+        state.get(key) or {}
+        for key in ('safety_results', 'recommendation_results', 'deficiency_results')
+    )
+
     # Pull cypher from safety_results if available (most detailed)
-    safety = state.get('safety_results') or {}
     queries_run = safety.get('queries_run', [])
     if queries_run:
         cypher_query = queries_run[0].get('cypher', '')
         results_count += len(safety.get('interactions', []))
         if safety.get('interactions'):
-            raw_results = safety['interactions'][:10]
+            raw_results = [
+                {key: row.get(key) for key in INTERACTION_DISPLAY_FIELDS}
+                for row in islice(safety['interactions'], RAW_RESULTS_SHOWN)
+            ]
 
     # Pull from recommendation_results
-    recommendations = state.get('recommendation_results') or {}
     if recommendations.get('recommendations'):
         results_count += len(recommendations['recommendations'])
         if not cypher_query:
-            cypher_query = """MATCH (s:Supplement)-[:TREATS]->(sym:Symptom)
-WHERE toLower(sym.symptom_name) CONTAINS $condition
-RETURN s.supplement_name, sym.symptom_name"""
+            # The recommendation agent doesn't record its Cypher; this is
+            # its symptom search (RecommendationAgent._manual_symptom_search)
+            cypher_query = """CALL db.index.fulltext.queryNodes($index_name, $search) YIELD node AS sym, score
+MATCH (s:Supplement)-[:TREATS]->(sym)
+WITH s, max(score) AS relevance, collect(DISTINCT sym.symptom_name) AS symptoms
+RETURN s.supplement_name AS supplement, symptoms, relevance
+ORDER BY relevance DESC, supplement
+LIMIT $limit"""
         if not raw_results:
-            raw_results = recommendations['recommendations'][:10]
+            raw_results = list(islice(recommendations['recommendations'], RAW_RESULTS_SHOWN))
 
     # Pull from deficiency_results
-    deficiency = state.get('deficiency_results') or {}
     if deficiency.get('at_risk'):
         results_count += len(deficiency['at_risk'])
         if not cypher_query:
-            cypher_query = """MATCH (dr:DietaryRestriction)-[r:DEFICIENT_IN]->(n:Nutrient)
-WHERE toLower(dr.dietary_restriction_name) IN $restrictions
+            # Likewise the deficiency agent's query (DietaryDeficiencyAgent)
+            cypher_query = """UNWIND $restrictions AS restriction
+MATCH (dr:DietaryRestriction {dietary_restriction_name_lower: restriction})
+      -[r:DEFICIENT_IN]->(n:Nutrient)
 RETURN dr.dietary_restriction_name AS diet,
        n.nutrient_name AS nutrient,
        r.risk_level AS risk_level"""
         if not raw_results:
-            raw_results = deficiency.get('deficiency_details', [])[:10]
+            raw_results = list(islice(deficiency.get('deficiency_details', []), RAW_RESULTS_SHOWN))
 
     # Fallback to query_history
     if results_count == 0:
@@ -138,25 +248,95 @@ RETURN dr.dietary_restriction_name AS diet,
         'error': state.get('error_message'),
         'confidence': state.get('confidence_level', 0),
         'evidence_chain': state.get('evidence_chain', []),
-        'safety_results': safety,
         'iterations': state.get('iterations', 0),
     }
 
 
+@st.cache_data(ttl=600, max_entries=200, show_spinner=False)
+def answer_question(question: str, profile: dict) -> dict:
+    """
+    Run the workflow and translate its state for display.
+
+    Cached on (question, profile): asking the same thing with the same
+    sidebar profile skips the LLM calls and graph queries entirely.
+    The workflow and graph come from initialize_system() rather than
+    arguments, since Streamlit can't hash them. Degraded runs raise
+    UncachedAnswer instead of returning, so they are retried next time.
+    """
+    from workflow.graph_builder import stream_workflow
+
+    workflow, graph = initialize_system()
+
+    # Stream the LangGraph workflow so the user sees each agent finish
+    # instead of a bare spinner. The placeholder is created here, inside
+    # the cached function: Streamlit replays it on cache hits, and it is
+    # cleared before returning, so a hit shows nothing stale.
+    progress = st.empty()
+    raw_state = {}
+    for mode, chunk in stream_workflow(
+        workflow,
+        question,
+        profile,
+        graph_interface=graph,      # ← passes graph to state
+        stream_mode=["updates", "values"],
+    ):
+        if mode == "updates":
+            progress.caption(f"✓ {', '.join(chunk)} finished")
+        else:
+            raw_state = chunk
+    progress.empty()
+
+    # Translate LangGraph state → UI display dict
+    result = translate_result(raw_state)
+    if is_degraded(raw_state):
+        raise UncachedAnswer(result)
+    return result
+
+
+# ======================================================================
+# Profile
+# ======================================================================
+
+@st.cache_data(show_spinner=False)
+def build_profile(medications: str, supplements: str, conditions: tuple, diet: tuple) -> dict:
+    """
+    Build the workflow profile from sidebar inputs, omitting empty fields.
+    Cached on the raw inputs, so re-asking with an unchanged sidebar skips
+    the parsing.
+    """
+    fields = (
+        ('medications', medications.split(',') if medications else ()),
+        ('supplements', supplements.split(',') if supplements else ()),
+        ('conditions', conditions),
+        ('dietary_restrictions', diet),
+    )
+    profile = {}
+    for key, raw in fields:
+        items = [item for item in map(str.strip, raw) if item]
+        if items:
+            profile[key] = items
+    return profile
+
+
 # ======================================================================
 # Display helpers
 # ======================================================================
 
-def display_answer(result: dict):
+# Substring matches (no word boundaries) to keep the old `kw in answer`
+# behaviour; one case-insensitive scan instead of lower() plus N searches
+_WARNING_RE = re.compile(r'warning|caution|critical|risk|avoid|dangerous', re.IGNORECASE)
+
+
+def has_safety_warning(answer: str) -> bool:
+    """True if the answer mentions any safety keyword."""
+    return _WARNING_RE.search(answer) is not None
+
+
+def display_answer(result: dict, has_warning: bool):
     """Display the answer with appropriate formatting."""
     answer = result.get('answer', '')
     question_type = result.get('question_type', '')
 
-    has_warning = any(
-        kw in answer.lower()
-        for kw in ['warning', 'caution', 'critical', 'risk', 'avoid', 'dangerous']
-    )
-
     if has_warning:
         st.error("⚠️ SAFETY ALERT")
         st.warning(
@@ -174,61 +354,77 @@ def display_answer(result: dict):
         st.info(answer)
 
 
+@lru_cache(maxsize=256)
+def join_names(names: tuple) -> str:
+    """Comma-joined entity names; the same lists recur across reruns."""
+    return ', '.join(names)
+
+
 def display_debug_panel(result: dict):
     """Show technical details in an expander."""
+    # Read every field once up front
+    q_type = result.get('question_type', 'Unknown')
+    entities = result.get('entities') or {}
+    supps = entities.get('supplements', ())
+    meds = entities.get('medications', ())
+    diets = entities.get('dietary_restrictions', ())
+    results_count = result.get('results_count', 0)
+    confidence = result.get('confidence', 0)
+    iterations = result.get('iterations', 0)
+    error = result.get('error')
+    evidence = result.get('evidence_chain', [])
+    cypher_query = result.get('cypher_query')
+    raw_results = result.get('raw_results')
+
     with st.expander("🔍 How this answer was generated"):
         col1, col2 = st.columns(2)
 
+        # One markdown block per column: each st.* call is a separate
+        # message to the browser
         with col1:
-            st.markdown("**Query Classification**")
-            st.write(f"Type: `{result.get('question_type', 'Unknown')}`")
-
-            st.markdown("**Entities Extracted**")
-            entities = result.get('entities', {})
-            supps = entities.get('supplements', [])
-            meds = entities.get('medications', [])
-            diets = entities.get('dietary_restrictions', [])
+            lines = [
+                "**Query Classification**",
+                f"Type: `{q_type}`",
+                "**Entities Extracted**",
+            ]
             if supps:
-                st.write(f"• Supplements: {', '.join(supps)}")
+                lines.append(f"• Supplements: {join_names(tuple(supps))}")
             if meds:
-                st.write(f"• Medications: {', '.join(meds)}")
+                lines.append(f"• Medications: {join_names(tuple(meds))}")
             if diets:
-                st.write(f"• Dietary Restrictions: {', '.join(diets)}")
+                lines.append(f"• Dietary Restrictions: {join_names(tuple(diets))}")
             if not supps and not meds and not diets:
-                st.write("• None extracted from question")
+                lines.append("• None extracted from question")
+            st.markdown("\n\n".join(lines))
 
         with col2:
-            st.markdown("**Results Found**")
-            st.write(f"{result.get('results_count', 0)} records")
-
-            confidence = result.get('confidence', 0)
+            lines = [
+                "**Results Found**",
+                f"{results_count} records",
+            ]
             if confidence:
-                st.write(f"Confidence: {confidence:.0%}")
+                lines.append(f"Confidence: {confidence:.0%}")
+            lines.append(f"Iterations: {iterations}")
+            st.markdown("\n\n".join(lines))
 
-            st.write(f"Iterations: {result.get('iterations', 0)}")
-
-            if result.get('error'):
-                st.error(f"Error: {result['error']}")
+            if error:
+                st.error(f"Error: {error}")
 
         # Evidence chain
-        evidence = result.get('evidence_chain', [])
         if evidence:
-            st.markdown("**Evidence Chain**")
-            for step in evidence:
-                st.write(f"→ {step}")
+            st.markdown("\n\n".join(["**Evidence Chain**", *(f"→ {step}" for step in evidence)]))
 
         # Cypher query
-        if result.get('cypher_query'):
+        if cypher_query:
             st.markdown("**Database Query (Cypher)**")
-            st.code(result['cypher_query'], language='cypher')
+            st.code(cypher_query, language='cypher')
         else:
-            st.markdown("**Database Query**")
-            st.write("Used LLM reasoning (no database query)")
+            st.markdown("**Database Query**\n\nUsed LLM reasoning (no database query)")
 
         # Raw results
-        if result.get('raw_results'):
+        if raw_results:
             st.markdown("**Sample Database Results**")
-            st.json(result['raw_results'])
+            st.json(raw_results)
 
 
 # ======================================================================
@@ -242,8 +438,9 @@ def main():
     # Initialize
     workflow, graph = initialize_system()
 
+    # Bounded so session state (re-serialized on every rerun) stays small
     if 'chat_history' not in st.session_state:
-        st.session_state.chat_history = []
+        st.session_state.chat_history = deque(maxlen=CHAT_HISTORY_SIZE)
 
     # ------------------------------------------------------------------
     # Sidebar
@@ -283,21 +480,7 @@ def main():
 
         st.divider()
 
-        with st.expander("📊 Database Info"):
-            try:
-                stats_query = """
-                MATCH (s:Supplement) WITH count(s) as supplements
-                MATCH (m:Medication) WITH supplements, count(m) as medications
-                MATCH (d:Drug) WITH supplements, medications, count(d) as drugs
-                RETURN supplements, medications, drugs
-                """
-                stats = graph.execute_query(stats_query)
-                if stats:
-                    st.metric("Supplements", stats[0]['supplements'])
-                    st.metric("Medications", stats[0]['medications'])
-                    st.metric("Drugs (DrugBank)", stats[0]['drugs'])
-            except Exception:
-                st.caption("Stats unavailable")
+        render_db_stats(graph)
 
         st.divider()
         st.caption("⚠️ Educational tool only. Always consult healthcare providers.")
@@ -340,60 +523,51 @@ def main():
     # Process question
     # ------------------------------------------------------------------
     if ask_button and question:
-        # Build profile from sidebar inputs
-        profile = {}
+        profile = build_profile(medications, supplements, tuple(conditions), tuple(diet))
+        ask_key = (question.strip(), profile)
 
-        if medications:
-            meds = [m.strip() for m in medications.split(',') if m.strip()]
-            if meds:
-                profile['medications'] = meds
+        # An accidental re-submit of the question just answered re-renders
+        # that answer instead of running the workflow (or adding history)
+        last_ask = st.session_state.get('last_ask')
+        is_repeat = last_ask is not None and last_ask[0] == ask_key
 
-        if supplements:
-            supps = [s.strip() for s in supplements.split(',') if s.strip()]
-            if supps:
-                profile['supplements'] = supps
-
-        if conditions:
-            profile['conditions'] = conditions
-
-        if diet:
-            profile['dietary_restrictions'] = diet
-
-        with st.spinner("🔍 Analyzing knowledge graph..."):
-            try:
-                # Run the LangGraph workflow
-                raw_state = run_workflow(
-                    workflow,
-                    question,
-                    profile if profile else {},
-                    graph_interface=graph,      # ← passes graph to state
-                )
-
-                # Translate LangGraph state → UI display dict
-                result = translate_result(raw_state)
-
-            except Exception as e:
-                st.error(f"Error: {str(e)}")
-                st.info("Please try rephrasing your question or check your database connection.")
-                import traceback
-                with st.expander("Error details"):
-                    st.code(traceback.format_exc())
-                return
+        if is_repeat:
+            result = last_ask[1]
+        else:
+            with st.spinner("🔍 Analyzing knowledge graph..."):
+                try:
+                    result = answer_question(*ask_key)
+
+                except UncachedAnswer as degraded:
+                    result = degraded.result
+
+                except Exception as e:
+                    st.error(f"Error: {str(e)}")
+                    st.info("Please try rephrasing your question or check your database connection.")
+                    import traceback
+                    with st.expander("Error details"):
+                        st.code(traceback.format_exc())
+                    return
+
+                else:
+                    # Only a complete answer short-circuits a re-submit
+                    st.session_state.last_ask = (ask_key, result)
+
+        # Scanned once; shared by the alert banner and the history icon
+        has_warning = has_safety_warning(result['answer'])
 
         # Display
-        display_answer(result)
+        display_answer(result, has_warning)
         display_debug_panel(result)
 
         # Add to history
-        st.session_state.chat_history.append({
-            'question': question,
-            'answer': result['answer'],
-            'question_type': result.get('question_type', 'unknown'),
-            'has_warning': any(
-                kw in result['answer'].lower()
-                for kw in ['warning', 'risk', 'caution', 'dangerous']
-            ),
-        })
+        if not is_repeat:
+            st.session_state.chat_history.append({
+                'question': question,
+                'answer': result['answer'],
+                'question_type': result.get('question_type', 'unknown'),
+                'has_warning': has_warning,
+            })
 
     # ------------------------------------------------------------------
     # Chat history
@@ -402,21 +576,17 @@ def main():
         st.divider()
         st.subheader("Recent Questions")
 
-        for item in reversed(st.session_state.chat_history[-3:]):
-            if item.get('has_warning'):
-                icon = "⚠️"
-            elif item.get('question_type') == 'comparison':
-                icon = "⚖️"
-            elif item.get('question_type') == 'recommendation':
-                icon = "💡"
-            else:
-                icon = "💬"
+        history = st.session_state.chat_history
+        for item in islice(reversed(history), HISTORY_SHOWN):
+            key = 'warning' if item.get('has_warning') else item.get('question_type')
+            icon = _HISTORY_ICONS.get(key, "💬")
 
             with st.expander(f"{icon} {item['question'][:60]}..."):
                 st.write(item['answer'])
 
         if st.button("Clear History"):
-            st.session_state.chat_history = []
+            st.session_state.chat_history.clear()
+            st.session_state.pop('last_ask', None)
             st.rerun()
 
     # Footer
@@ -11,11 +11,17 @@ This is where the "map" of the workflow is created.
 """
 
 from langgraph.graph import StateGraph, END
-from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Any, Callable, Dict, Optional, Tuple
+import asyncio
+import importlib
+import logging
 import os
+import weakref
 
 # Import state definition
-from workflow.state import ConversationState
+from workflow.state import ConversationState, is_max_iterations_reached
 
 # Import routing functions
 from workflow.routing import (
@@ -25,118 +31,291 @@ from workflow.routing import (
     NodeNames
 )
 
-# Import agent functions
-from agents.supervisor import supervisor_agent
-from agents.safety_check_agent import safety_check_agent
-from agents.deficiency_agent import deficiency_agent
-from agents.recommendation_agent import recommendation_agent
-from agents.synthesis_agent import synthesis_agent
+# Agent modules are imported in _assemble_state_graph, and only for the
+# agents a workflow enables
 
 
-def build_workflow(
-    enable_safety: bool = True,
-    enable_deficiency: bool = True,
-    enable_recommendations: bool = True,
-    max_iterations: int = 10
-):
+# Build-time progress goes to DEBUG; enable it with logging, not prints
+logger = logging.getLogger(__name__)
+
+
+# ==================== SUPERVISOR ROUTING TABLES ====================
+# Map routing function output to node names
+
+_SEQUENTIAL_ROUTING: Dict[str, str] = {
+    NodeNames.SAFETY_CHECK: NodeNames.SAFETY_CHECK,
+    NodeNames.DEFICIENCY_CHECK: NodeNames.DEFICIENCY_CHECK,
+    NodeNames.RECOMMENDATION: NodeNames.RECOMMENDATION,
+    NodeNames.SYNTHESIS: NodeNames.SYNTHESIS,
+    NodeNames.SUPERVISOR: NodeNames.SUPERVISOR,  # Loop back!
+    NodeNames.END: END,
+}
+
+# Any specialist decision goes to the one node that runs them all
+_PARALLEL_ROUTING: Dict[str, str] = {
+    **_SEQUENTIAL_ROUTING,
+    NodeNames.SAFETY_CHECK: NodeNames.SPECIALISTS,
+    NodeNames.DEFICIENCY_CHECK: NodeNames.SPECIALISTS,
+    NodeNames.RECOMMENDATION: NodeNames.SPECIALISTS,
+}
+
+
+# ==================== PARALLEL SPECIALISTS ====================
+
+# Supervisor pending-check name → (agent module, agent function, state keys that agent owns)
+SPECIALISTS: Dict[str, Tuple[str, str, Tuple[str, ...]]] = {
+    'safety_check': ('agents.safety_check_agent', 'safety_check_agent', ('safety_checked', 'safety_results')),
+    'deficiency_check': ('agents.deficiency_agent', 'deficiency_agent', ('deficiency_checked', 'deficiency_results')),
+    'recommendations': ('agents.recommendation_agent', 'recommendation_agent', ('recommendations_checked', 'recommendation_results')),
+}
+
+
+def _load_specialist(check: str) -> Callable:
+    """Import a specialist agent's module on first use and return its node function."""
+    module_name, function_name, _ = SPECIALISTS[check]
+    return getattr(importlib.import_module(module_name), function_name)
+
+
+def make_specialists_node(enabled_checks: Tuple[str, ...]) -> Callable:
     """
-    Build the complete agentic workflow
+    Build a node that runs every pending specialist check at once.
+    
+    The supervisor records the outstanding checks in state['pending_checks'].
+    Each agent is independent (its own Neo4j sessions and LLM calls), so
+    they run on a thread pool, each against its own copy of the state, and
+    their results are merged back in the supervisor's check order. The
+    question costs roughly one specialist's latency instead of the sum.
     
     Args:
-        enable_safety: Whether to enable safety check agent
-        enable_deficiency: Whether to enable deficiency agent
-        enable_recommendations: Whether to enable recommendation agent
-        max_iterations: Maximum supervisor iterations
+        enabled_checks: Names from SPECIALISTS that this workflow allows
         
     Returns:
-        Compiled LangGraph workflow (CompiledGraph)
+        Node function taking ConversationState and returning only the
+        keys it updated (a partial state update)
+    """
+    agents = {check: _load_specialist(check) for check in enabled_checks}
+    
+    def run_specialists_parallel(state: Dict[str, Any]) -> Dict[str, Any]:
+        pending = [c for c in (state.get('pending_checks') or []) if c in enabled_checks]
+        if not pending:
+            return {'pending_checks': []}
         
-    Example:
-        >>> workflow = build_workflow()
-        >>> result = workflow.invoke(initial_state)
-        >>> print(result['final_answer'])
+        base_evidence = list(state.get('evidence_chain') or [])
+        base_history = list(state.get('query_history') or [])
+        
+        # Agents append to these lists in place, so each gets its own
+        def _run(check: str) -> Dict[str, Any]:
+            return agents[check]({
+                **state,
+                'evidence_chain': list(base_evidence),
+                'query_history': list(base_history),
+            })
+        
+        logger.info("⚡ SPECIALISTS: Running %s in parallel...", ", ".join(pending))
+        with ThreadPoolExecutor(max_workers=len(pending)) as pool:
+            outputs = list(pool.map(_run, pending))
+        
+        # Return only the keys the specialists changed, so LangGraph writes
+        # those channels instead of the whole state. Each output starts with
+        # the baseline entries; only what follows them is that agent's.
+        n_evidence, n_history = len(base_evidence), len(base_history)
+        base_confidence = state.get('confidence_level')
+        update: Dict[str, Any] = {}
+        evidence, history = list(base_evidence), list(base_history)
+        for check, output in zip(pending, outputs):
+            owned_keys = SPECIALISTS[check][2]
+            for key in owned_keys:
+                update[key] = output.get(key)
+            # Every output carries confidence_level (each agent got a full
+            # copy of the state); take it only from agents that set it.
+            # Later checks win, as they would running one after another
+            if output.get('confidence_level', base_confidence) != base_confidence:
+                update['confidence_level'] = output['confidence_level']
+            evidence.extend((output.get('evidence_chain') or [])[n_evidence:])
+            history.extend((output.get('query_history') or [])[n_history:])
+        update['evidence_chain'] = evidence
+        update['query_history'] = history
+        update['pending_checks'] = []
+        return update
+    
+    return run_specialists_parallel
+
+
+def _assemble_state_graph(
+    enable_safety: bool = True,
+    enable_deficiency: bool = True,
+    enable_recommendations: bool = True,
+    max_iterations: int = 10,
+    parallel_specialists: bool = True
+) -> StateGraph:
+    """
+    Add the nodes and edges for build_workflow, without compiling.
+    
+    Kept separate so build_workflow_with_checkpoints can compile the same
+    graph exactly once with its checkpointer.
     """
     
+    from agents.supervisor import supervisor_agent
+    from agents.synthesis_agent import synthesis_agent
+    
     # Create the graph with our state definition
     workflow = StateGraph(ConversationState)
     
-    print("🏗️  Building workflow graph...")
+    logger.debug("🏗️  Building workflow graph...")
     
     # ==================== ADD NODES ====================
     # Each node is an agent function that takes state and returns state
     
-    print("   Adding supervisor node...")
+    logger.debug("   Adding supervisor node...")
     workflow.add_node(NodeNames.SUPERVISOR, supervisor_agent)
     
-    if enable_safety:
-        print("   Adding safety_check node...")
-        workflow.add_node(NodeNames.SAFETY_CHECK, safety_check_agent)
-    
-    if enable_deficiency:
-        print("   Adding deficiency_check node...")
-        workflow.add_node(NodeNames.DEFICIENCY_CHECK, deficiency_agent)
-    
-    if enable_recommendations:
-        print("   Adding recommendation node...")
-        workflow.add_node(NodeNames.RECOMMENDATION, recommendation_agent)
+    if parallel_specialists:
+        enabled_checks = tuple(
+            check for check, enabled in (
+                ('safety_check', enable_safety),
+                ('deficiency_check', enable_deficiency),
+                ('recommendations', enable_recommendations),
+            ) if enabled
+        )
+        logger.debug("   Adding parallel specialists node (%s)...", ", ".join(enabled_checks))
+        workflow.add_node(NodeNames.SPECIALISTS, make_specialists_node(enabled_checks))
+    else:
+        if enable_safety:
+            logger.debug("   Adding safety_check node...")
+            workflow.add_node(NodeNames.SAFETY_CHECK, _load_specialist('safety_check'))
+        
+        if enable_deficiency:
+            logger.debug("   Adding deficiency_check node...")
+            workflow.add_node(NodeNames.DEFICIENCY_CHECK, _load_specialist('deficiency_check'))
+        
+        if enable_recommendations:
+            logger.debug("   Adding recommendation node...")
+            workflow.add_node(NodeNames.RECOMMENDATION, _load_specialist('recommendations'))
     
-    print("   Adding synthesis node...")
+    logger.debug("   Adding synthesis node...")
     workflow.add_node(NodeNames.SYNTHESIS, synthesis_agent)
     
     # ==================== ADD EDGES ====================
     
     # CONDITIONAL EDGE from supervisor
     # The supervisor can route to different specialists or finish
-    print("   Setting up supervisor routing...")
+    logger.debug("   Setting up supervisor routing...")
+    
+    def route_with_iteration_limit(state: Dict[str, Any]) -> str:
+        # Hard stop: once the supervisor has run max_iterations times,
+        # answer with what we have instead of starting another round
+        if is_max_iterations_reached(state, max_iterations):
+            logger.info("🚦 ROUTING: Max iterations (%d) reached → synthesis", max_iterations)
+            return NodeNames.SYNTHESIS
+        return route_supervisor_decision(state)
+    
     workflow.add_conditional_edges(
         NodeNames.SUPERVISOR,  # From supervisor
-        route_supervisor_decision,  # Use this function to decide
-        {
-            # Map routing function output to node names
-            NodeNames.SAFETY_CHECK: NodeNames.SAFETY_CHECK,
-            NodeNames.DEFICIENCY_CHECK: NodeNames.DEFICIENCY_CHECK,
-            NodeNames.RECOMMENDATION: NodeNames.RECOMMENDATION,
-            NodeNames.SYNTHESIS: NodeNames.SYNTHESIS,
-            NodeNames.SUPERVISOR: NodeNames.SUPERVISOR,  # Loop back!
-            NodeNames.END: END
-        }
+        route_with_iteration_limit,  # Use this function to decide
+        _PARALLEL_ROUTING if parallel_specialists else _SEQUENTIAL_ROUTING
     )
     
     # SIMPLE EDGES back to supervisor after specialists
     # After any specialist finishes, go back to supervisor
-    if enable_safety:
-        print("   Safety agent → Supervisor")
-        workflow.add_edge(NodeNames.SAFETY_CHECK, NodeNames.SUPERVISOR)
-    
-    if enable_deficiency:
-        print("   Deficiency agent → Supervisor")
-        workflow.add_edge(NodeNames.DEFICIENCY_CHECK, NodeNames.SUPERVISOR)
-    
-    if enable_recommendations:
-        print("   Recommendation agent → Supervisor")
-        workflow.add_edge(NodeNames.RECOMMENDATION, NodeNames.SUPERVISOR)
+    if parallel_specialists:
+        logger.debug("   Specialists → Supervisor")
+        workflow.add_edge(NodeNames.SPECIALISTS, NodeNames.SUPERVISOR)
+    else:
+        if enable_safety:
+            logger.debug("   Safety agent → Supervisor")
+            workflow.add_edge(NodeNames.SAFETY_CHECK, NodeNames.SUPERVISOR)
+        
+        if enable_deficiency:
+            logger.debug("   Deficiency agent → Supervisor")
+            workflow.add_edge(NodeNames.DEFICIENCY_CHECK, NodeNames.SUPERVISOR)
+        
+        if enable_recommendations:
+            logger.debug("   Recommendation agent → Supervisor")
+            workflow.add_edge(NodeNames.RECOMMENDATION, NodeNames.SUPERVISOR)
     
     # SIMPLE EDGE from synthesis to END
     # Once synthesis is done, we're finished
-    print("   Synthesis → END")
+    logger.debug("   Synthesis → END")
     workflow.add_edge(NodeNames.SYNTHESIS, END)
     
     # ==================== SET ENTRY POINT ====================
     # Workflow always starts at supervisor
-    print("   Setting entry point: supervisor")
+    logger.debug("   Setting entry point: supervisor")
     workflow.set_entry_point(NodeNames.SUPERVISOR)
     
+    return workflow
+
+
+@lru_cache(maxsize=16)
+def build_workflow(
+    enable_safety: bool = True,
+    enable_deficiency: bool = True,
+    enable_recommendations: bool = True,
+    max_iterations: int = 10,
+    parallel_specialists: bool = True
+):
+    """
+    Build the complete agentic workflow
+    
+    Args:
+        enable_safety: Whether to enable safety check agent
+        enable_deficiency: Whether to enable deficiency agent
+        enable_recommendations: Whether to enable recommendation agent
+        max_iterations: Maximum supervisor iterations
+        parallel_specialists: Run all pending specialist checks in one
+            parallel step instead of one supervisor round-trip each
+        
+    Returns:
+        Compiled LangGraph workflow (CompiledGraph). Compiled graphs are
+        stateless between invocations, so one is built per distinct set of
+        arguments and shared by every later call.
+        
+    Example:
+        >>> workflow = build_workflow()
+        >>> result = workflow.invoke(initial_state)
+        >>> print(result['final_answer'])
+    """
+    workflow = _assemble_state_graph(
+        enable_safety=enable_safety,
+        enable_deficiency=enable_deficiency,
+        enable_recommendations=enable_recommendations,
+        max_iterations=max_iterations,
+        parallel_specialists=parallel_specialists,
+    )
+    
     # ==================== COMPILE ====================
-    print("   Compiling workflow...")
+    logger.debug("   Compiling workflow...")
     compiled_workflow = workflow.compile()
     
-    print("✅ Workflow built successfully!\n")
+    logger.debug("✅ Workflow built successfully!")
     
     return compiled_workflow
 
 
+def _make_sqlite_saver(path: str):
+    """
+    Open a SqliteSaver tuned for concurrent checkpoint writes.
+    
+    check_same_thread=False lets LangGraph's worker threads share the
+    connection; the saver serializes its own writes, so this is safe.
+    WAL lets readers proceed during a write, and synchronous=NORMAL is
+    durable enough for conversation checkpoints.
+    
+    Requires the langgraph-checkpoint-sqlite package.
+    """
+    import sqlite3
+    from langgraph.checkpoint.sqlite import SqliteSaver
+    
+    conn = sqlite3.connect(path, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    return SqliteSaver(conn)
+
+
 def build_workflow_with_checkpoints(
     checkpointer=None,
+    persist_path: Optional[str] = None,
     **kwargs
 ):
     """
@@ -150,6 +329,8 @@ def build_workflow_with_checkpoints(
     
     Args:
         checkpointer: LangGraph checkpointer (e.g., SqliteSaver)
+        persist_path: SQLite file to checkpoint into when no checkpointer
+            is given (opened with _make_sqlite_saver)
         **kwargs: Additional arguments for build_workflow
         
     Returns:
@@ -165,24 +346,24 @@ def build_workflow_with_checkpoints(
         ...     initial_state,
         ...     {"configurable": {"thread_id": "user-123"}}
         ... )
+        >>> 
+        >>> # Or let it open a WAL-mode SQLite file
+        >>> workflow = build_workflow_with_checkpoints(persist_path="checkpoints.db")
     """
-    # Build base workflow
-    workflow = StateGraph(ConversationState)
-
-    # If the caller passed a compiled checkpointer, compile the graph with it
-    base = build_workflow(**kwargs)
+    if checkpointer is None and persist_path:
+        checkpointer = _make_sqlite_saver(persist_path)
+    
+    if checkpointer is None:
+        return build_workflow(**kwargs)
+    
+    # Compile once with the checkpointer (a compiled graph can't be
+    # re-compiled, and the cached build_workflow graph must stay shared)
+    logger.debug("   Compiling workflow with checkpointer...")
+    return _assemble_state_graph(**kwargs).compile(checkpointer=checkpointer)
 
-    # If a checkpointer is provided and the compiled graph supports it,
-    # re-compile the base workflow with the checkpointer to enable persistence.
-    if checkpointer is not None:
-        try:
-            compiled_with_cp = base.compile(checkpointer=checkpointer)
-            return compiled_with_cp
-        except Exception:
-            # Fall back to previously compiled graph if checkpointing fails
-            return base
 
-    return base
+# Compiled workflow → rendered PNG bytes; entries go with the graph
+_VIZ_CACHE: "weakref.WeakKeyDictionary[Any, bytes]" = weakref.WeakKeyDictionary()
 
 
 def visualize_workflow(workflow, output_path: str = "workflow_graph.png"):
@@ -198,20 +379,25 @@ def visualize_workflow(workflow, output_path: str = "workflow_graph.png"):
         >>> visualize_workflow(workflow, "my_workflow.png")
     """
     try:
+        # A compiled workflow never changes, so render each one once
+        graph_image = _VIZ_CACHE.get(workflow)
+        
+        if graph_image is None:
+            graph_obj = workflow.get_graph()
+            # Some LangGraph versions expose draw_png(), others expose draw()
+            if hasattr(graph_obj, "draw_png"):
+                graph_image = graph_obj.draw_png()
+            elif hasattr(graph_obj, "draw"):
+                # draw() may return bytes or an object with _repr_png_
+                graph_image = graph_obj.draw()
+            else:
+                raise RuntimeError("Graph object has no draw_png/draw method")
+            if isinstance(graph_image, (bytes, bytearray)):
+                _VIZ_CACHE[workflow] = graph_image
+        
+        # Only needed to hand the image back, so imported last
         from IPython.display import Image
-
-        # Try to get a PNG bytes representation from the compiled workflow
-        graph_obj = workflow.get_graph()
-
-        # Some LangGraph versions expose draw_png(), others expose draw()
-        if hasattr(graph_obj, "draw_png"):
-            graph_image = graph_obj.draw_png()
-        elif hasattr(graph_obj, "draw"):
-            # draw() may return bytes or an object with _repr_png_
-            graph_image = graph_obj.draw()
-        else:
-            raise RuntimeError("Graph object has no draw_png/draw method")
-
+        
         # Save to file if bytes-like
         if isinstance(graph_image, (bytes, bytearray)):
             with open(output_path, 'wb') as f:
@@ -230,16 +416,29 @@ def visualize_workflow(workflow, output_path: str = "workflow_graph.png"):
         return None
 
 
+_END_STR = str(END)
+
+# Compiled workflow → get_workflow_info() result; entries go with the graph
+_INFO_CACHE: "weakref.WeakKeyDictionary[Any, dict]" = weakref.WeakKeyDictionary()
+
+
 def get_workflow_info(workflow) -> dict:
     """
     Get information about the workflow structure
     
+    Computed once per compiled workflow and cached; treat the returned
+    dict as read-only.
+    
     Args:
         workflow: Compiled workflow
         
     Returns:
         Dict with workflow info
     """
+    cached = _INFO_CACHE.get(workflow)
+    if cached is not None:
+        return cached
+
     graph = workflow.get_graph()
 
     info = {
@@ -249,14 +448,16 @@ def get_workflow_info(workflow) -> dict:
         'end_nodes': []
     }
 
-    # Get edges and detect end nodes
-    for node, edges in graph.nodes.items():
-        # edges might be stored as a list of node names or objects
-        for edge in edges:
-            info['edges'].append(f"{node} → {edge}")
-            # If the edge is the END sentinel, mark this node as leading to END
-            if edge == END or (isinstance(edge, str) and edge == str(END)):
-                info['end_nodes'].append(node)
+    # Get edges (deduplicated as we go) and detect end nodes
+    seen_edges = set()
+    for edge in graph.edges:
+        label = f"{edge.source} → {edge.target}"
+        if label not in seen_edges:
+            seen_edges.add(label)
+            info['edges'].append(label)
+        # If the edge is the END sentinel, mark this node as leading to END
+        if edge.target is END or edge.target == _END_STR:
+            info['end_nodes'].append(edge.source)
 
     # Attempt to get the configured entry point if available
     entry = None
@@ -277,6 +478,7 @@ def get_workflow_info(workflow) -> dict:
     # Deduplicate end_nodes
     info['end_nodes'] = list(dict.fromkeys(info['end_nodes']))
 
+    _INFO_CACHE[workflow] = info
     return info
 
 
@@ -313,6 +515,19 @@ def build_comprehensive_workflow():
 
 # ==================== EXECUTION HELPERS ====================
 
+def _initial_state(user_question: str, patient_profile: dict, graph_interface=None) -> dict:
+    """Create the initial state and inject graph_interface for the agents."""
+    from workflow.state import create_initial_state
+    
+    initial_state = create_initial_state(user_question, patient_profile)
+    
+    # Inject graph_interface so agents (supervisor, safety, etc.) can use it
+    if graph_interface is not None:
+        initial_state['graph_interface'] = graph_interface
+    
+    return initial_state
+
+
 def run_workflow(
     workflow,
     user_question: str,
@@ -333,14 +548,7 @@ def run_workflow(
     Returns:
         Final state dict
     """
-    from workflow.state import create_initial_state
-    
-    # Create initial state
-    initial_state = create_initial_state(user_question, patient_profile)
-    
-    # Inject graph_interface so agents (supervisor, safety, etc.) can use it
-    if graph_interface is not None:
-        initial_state['graph_interface'] = graph_interface
+    initial_state = _initial_state(user_question, patient_profile, graph_interface)
     
     if verbose:
         print("🚀 Starting workflow execution...")
@@ -362,7 +570,9 @@ def run_workflow(
 def stream_workflow(
     workflow,
     user_question: str,
-    patient_profile: dict
+    patient_profile: dict,
+    graph_interface=None,
+    stream_mode="updates"
 ):
     """
     Stream workflow execution (see intermediate steps)
@@ -371,28 +581,87 @@ def stream_workflow(
         workflow: Compiled workflow
         user_question: User's question
         patient_profile: Patient health profile
+        graph_interface: Neo4j GraphInterface (passed to agents via state)
+        stream_mode: LangGraph stream mode ("updates", "values", or a
+            list of modes, which yields (mode, chunk) pairs)
         
     Yields:
         State updates as they happen
         
     Example:
         >>> workflow = build_workflow()
-        >>> for state in stream_workflow(workflow, question, profile):
-        ...     print(f"Node: {state['node']}")
-        ...     print(f"Decision: {state['supervisor_decision']}")
+        >>> for update in stream_workflow(workflow, question, profile):
+        ...     for node, changes in update.items():
+        ...         print(f"Node: {node}")
     """
-    from workflow.state import create_initial_state
-    
-    initial_state = create_initial_state(user_question, patient_profile)
+    initial_state = _initial_state(user_question, patient_profile, graph_interface)
     
     # Stream execution
-    for chunk in workflow.stream(initial_state):
+    for chunk in workflow.stream(initial_state, stream_mode=stream_mode):
+        yield chunk
+
+
+async def arun_workflow(
+    workflow,
+    user_question: str,
+    patient_profile: dict,
+    graph_interface=None,
+    verbose: bool = True
+) -> dict:
+    """
+    Async version of run_workflow (uses workflow.ainvoke)
+    
+    Lets an async server run several questions concurrently in one
+    process. The agents are plain functions, so LangGraph runs each node
+    in its thread pool instead of blocking the event loop.
+    
+    Example:
+        >>> result = asyncio.run(arun_workflow(workflow, question, profile))
+    """
+    initial_state = _initial_state(user_question, patient_profile, graph_interface)
+    
+    if verbose:
+        print("🚀 Starting workflow execution...")
+        print(f"   Question: {user_question}")
+        print()
+    
+    final_state = await workflow.ainvoke(initial_state)
+    
+    if verbose:
+        print("\n✅ Workflow complete!")
+        print(f"   Iterations: {final_state.get('iterations', 0)}")
+        print(f"   Confidence: {final_state.get('confidence_level', 0):.2f}")
+        print()
+    
+    return final_state
+
+
+async def astream_workflow(
+    workflow,
+    user_question: str,
+    patient_profile: dict,
+    graph_interface=None,
+    stream_mode="updates"
+):
+    """
+    Async version of stream_workflow (uses workflow.astream)
+    
+    Example:
+        >>> async for update in astream_workflow(workflow, question, profile):
+        ...     print(list(update))
+    """
+    initial_state = _initial_state(user_question, patient_profile, graph_interface)
+    
+    async for chunk in workflow.astream(initial_state, stream_mode=stream_mode):
         yield chunk
 
 
 # ==================== TESTING ====================
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    logger.setLevel(logging.DEBUG)
+    
     print("="*60)
     print("Building Workflow")
     print("="*60 + "\n")
@@ -426,12 +695,12 @@ if __name__ == "__main__":
     }
     
     try:
-        result = run_workflow(
+        result = asyncio.run(arun_workflow(
             workflow,
             "Is Fish Oil safe with my medications?",
             test_profile,
             verbose=True
-        )
+        ))
         
         if result.get('final_answer'):
             print("Final Answer:")
@@ -445,5 +714,8 @@ if __name__ == "__main__":
     print("Visualization")
     print("="*60 + "\n")
     
-    # Try to visualize
-    visualize_workflow(workflow, "/mnt/user-data/outputs/workflow_graph.png")
+    # Rendering is slow and needs IPython, so only on request
+    if os.environ.get("RENDER_GRAPH"):
+        visualize_workflow(workflow, "/mnt/user-data/outputs/workflow_graph.png")
+    else:
+        print("Skipped (set RENDER_GRAPH=1 to render the diagram)")
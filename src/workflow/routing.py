@@ -10,7 +10,12 @@ Key Concept:
 - No intelligence here - just simple mapping based on state
 """
 
-from typing import Dict, Any, Literal
+from typing import Dict, Any, Final, Literal
+import logging
+
+# Routing traces run on every supervisor hop; DEBUG with deferred
+# %-formatting keeps them free unless enabled
+logger = logging.getLogger(__name__)
 
 
 # ==================== NODE NAMES ====================
@@ -18,17 +23,45 @@ from typing import Dict, Any, Literal
 
 class NodeNames:
     """Constants for all node names in the workflow"""
-    SUPERVISOR = "supervisor"
-    SAFETY_CHECK = "safety_check"
-    DEFICIENCY_CHECK = "deficiency_check"
-    RECOMMENDATION = "recommendation"
-    SYNTHESIS = "synthesis"
-    END = "END"
+    SUPERVISOR: Final = "supervisor"
+    SAFETY_CHECK: Final = "safety_check"
+    DEFICIENCY_CHECK: Final = "deficiency_check"
+    RECOMMENDATION: Final = "recommendation"
+    SPECIALISTS: Final = "specialists"  # runs every pending check in parallel
+    SYNTHESIS: Final = "synthesis"
+    END: Final = "END"
+
+
+# Every value route_supervisor_decision can return, so type checkers
+# flag a misspelled or unregistered target
+RouteTarget = Literal["safety_check", "deficiency_check", "recommendation", "synthesis", "supervisor", "END"]
 
 
 # ==================== ROUTING FUNCTIONS ====================
 
-def route_supervisor_decision(state: Dict[str, Any]) -> str:
+# Supervisor decision → next node, built once at import
+# NOTE: Must match the exact strings supervisor._make_decision() returns
+_DECISION_TABLE: Dict[str, RouteTarget] = {
+    'check_safety': NodeNames.SAFETY_CHECK,
+    'check_deficiency': NodeNames.DEFICIENCY_CHECK,
+    # Recommendations (supervisor uses 'get_recommendations')
+    'get_recommendations': NodeNames.RECOMMENDATION,
+    'check_recommendations': NodeNames.RECOMMENDATION,  # alias
+    # Synthesis (supervisor uses 'synthesize')
+    'synthesize': NodeNames.SYNTHESIS,
+    'finish': NodeNames.SYNTHESIS,  # alias
+    # Loop back (supervisor uses 'need_more_evidence' or 'clarify')
+    'need_more_evidence': NodeNames.SUPERVISOR,
+    'clarify': NodeNames.SUPERVISOR,
+    'loop_back': NodeNames.SUPERVISOR,  # alias
+}
+
+
+def _route_lookup(decision: str) -> RouteTarget:
+    """Next node for a supervisor decision: the table lookup, with no trace."""
+    return _DECISION_TABLE.get(decision, NodeNames.END)
+
+def route_supervisor_decision(state: Dict[str, Any]) -> RouteTarget:
     """
     Route based on supervisor's decision
     
@@ -51,28 +84,11 @@ def route_supervisor_decision(state: Dict[str, Any]) -> str:
     """
     decision = state.get('supervisor_decision', '')
     
-    # Map supervisor decisions to node names
-    # NOTE: Must match the exact strings supervisor._make_decision() returns
-    route_map = {
-        'check_safety': NodeNames.SAFETY_CHECK,
-        'check_deficiency': NodeNames.DEFICIENCY_CHECK,
-        # Recommendations (supervisor uses 'get_recommendations')
-        'get_recommendations': NodeNames.RECOMMENDATION,
-        'check_recommendations': NodeNames.RECOMMENDATION,  # alias
-        # Synthesis (supervisor uses 'synthesize')
-        'synthesize': NodeNames.SYNTHESIS,
-        'finish': NodeNames.SYNTHESIS,  # alias
-        # Loop back (supervisor uses 'need_more_evidence' or 'clarify')
-        'need_more_evidence': NodeNames.SUPERVISOR,
-        'clarify': NodeNames.SUPERVISOR,
-        'loop_back': NodeNames.SUPERVISOR,  # alias
-    }
-    
     # Get the route, default to END if unknown
-    next_node = route_map.get(decision, NodeNames.END)
+    next_node = _route_lookup(decision)
     
     # Debug logging
-    print(f"🚦 ROUTING: '{decision}' → {next_node}")
+    logger.debug("🚦 ROUTING: '%s' → %s", decision, next_node)
     
     return next_node
 
@@ -90,7 +106,7 @@ def route_after_specialist(state: Dict[str, Any]) -> str:
     Returns:
         Always returns 'supervisor' (go back to supervisor)
     """
-    print(f"🚦 ROUTING: Specialist done → back to supervisor")
+    logger.debug("🚦 ROUTING: Specialist done → back to supervisor")
     return NodeNames.SUPERVISOR
 
 
@@ -106,7 +122,7 @@ def route_synthesis_complete(state: Dict[str, Any]) -> str:
     Returns:
         Always returns 'END'
     """
-    print(f"🚦 ROUTING: Synthesis complete → END")
+    logger.debug("🚦 ROUTING: Synthesis complete → END")
     return NodeNames.END
 
 
@@ -127,18 +143,24 @@ def route_with_safety_check(state: Dict[str, Any]) -> str:
     Returns:
         Node name to visit next
     """
+    error = state.get('error_message')
+    iterations = state.get('iterations', 0)
+    decision = state.get('supervisor_decision', '')
+    
     # Check for error state
-    if state.get('error_message'):
-        print("🚦 ROUTING: Error detected → synthesis")
+    if error:
+        logger.debug("🚦 ROUTING: Error detected → synthesis")
         return NodeNames.SYNTHESIS
     
     # Check max iterations
-    if state.get('iterations', 0) >= 10:
-        print("🚦 ROUTING: Max iterations reached → synthesis")
+    if iterations >= 10:
+        logger.debug("🚦 ROUTING: Max iterations reached → synthesis")
         return NodeNames.SYNTHESIS
     
     # Otherwise use normal routing
-    return route_supervisor_decision(state)
+    next_node = _route_lookup(decision)
+    logger.debug("🚦 ROUTING: '%s' → %s", decision, next_node)
+    return next_node
 
 
 def route_based_on_confidence(state: Dict[str, Any]) -> str:
@@ -159,37 +181,33 @@ def route_based_on_confidence(state: Dict[str, Any]) -> str:
     
     # If confidence is very low and we haven't tried much, loop back
     if confidence < 0.5 and iterations < 5:
-        print(f"🚦 ROUTING: Low confidence ({confidence:.2f}) → loop back to supervisor")
+        logger.debug("🚦 ROUTING: Low confidence (%.2f) → loop back to supervisor", confidence)
         return NodeNames.SUPERVISOR
     
     # If we've tried enough times, move on to synthesis
     if iterations >= 5:
-        print(f"🚦 ROUTING: Max investigation attempts → synthesis")
+        logger.debug("🚦 ROUTING: Max investigation attempts → synthesis")
         return NodeNames.SYNTHESIS
     
-    # Otherwise follow supervisor's decision
-    return route_supervisor_decision(state)
+    # Otherwise follow supervisor's decision (already read above)
+    next_node = _route_lookup(decision)
+    logger.debug("🚦 ROUTING: '%s' → %s", decision, next_node)
+    return next_node
 
 
 # ==================== TYPED ROUTING (For Better Type Safety) ====================
 
-def route_supervisor_typed(
-    state: Dict[str, Any]
-) -> Literal["safety_check", "deficiency_check", "recommendation", "synthesis", "supervisor", "END"]:
-    """
-    Typed version of supervisor routing for better IDE support
-    
-    Args:
-        state: Current conversation state
-        
-    Returns:
-        Literal type for better type checking
-    """
-    return route_supervisor_decision(state)
+# route_supervisor_decision is annotated with RouteTarget itself, so the
+# typed name is a plain alias rather than a wrapper with its own frame
+route_supervisor_typed = route_supervisor_decision
 
 
 # ==================== DEBUGGING HELPERS ====================
 
+# Indexed by a done/not-done flag
+_CHECKMARK = ('✗', '✓')
+
+
 def get_routing_summary(state: Dict[str, Any]) -> str:
     """
     Get a summary of current routing state
@@ -203,6 +221,7 @@ def get_routing_summary(state: Dict[str, Any]) -> str:
     decision = state.get('supervisor_decision', 'None')
     iterations = state.get('iterations', 0)
     confidence = state.get('confidence_level', 0.0)
+    next_node = _route_lookup(state.get('supervisor_decision', ''))
     
     summary = f"""
 Routing State:
@@ -212,11 +231,11 @@ Iterations: {iterations}/10
 Confidence: {confidence:.2f}
 
 What's Been Done:
-  Safety: {'✓' if state.get('safety_checked') else '✗'}
-  Deficiency: {'✓' if state.get('deficiency_checked') else '✗'}
-  Recommendations: {'✓' if state.get('recommendations_checked') else '✗'}
+  Safety: {_CHECKMARK[bool(state.get('safety_checked'))]}
+  Deficiency: {_CHECKMARK[bool(state.get('deficiency_checked'))]}
+  Recommendations: {_CHECKMARK[bool(state.get('recommendations_checked'))]}
 
-Next Node: {route_supervisor_decision(state)}
+Next Node: {next_node}
 """
     return summary
 
@@ -233,13 +252,8 @@ def trace_routing_path(states: list[Dict[str, Any]]) -> list[str]:
     Returns:
         List of node names visited
     """
-    path = []
-    for state in states:
-        decision = state.get('supervisor_decision', '')
-        next_node = route_supervisor_decision(state)
-        path.append(f"{decision} → {next_node}")
-    
-    return path
+    decisions = (state.get('supervisor_decision', '') for state in states)
+    return [f"{decision} → {_route_lookup(decision)}" for decision in decisions]
 
 
 # ==================== ROUTING RULES DOCUMENTATION ====================
@@ -292,6 +306,9 @@ START
 # ==================== TESTING ====================
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    logger.setLevel(logging.DEBUG)
+    
     print(ROUTING_RULES)
     print("\n" + "="*50 + "\n")
     
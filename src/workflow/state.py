@@ -148,6 +148,13 @@ class ConversationState(TypedDict):
     - 'loop_back': Supervisor needs to reconsider
     """
     
+    pending_checks: List[str]
+    """
+    Specialist checks the supervisor found still outstanding, e.g.
+    ['safety_check', 'deficiency_check']; the parallel specialists node
+    runs all of them in one step.
+    """
+    
     iterations: int
     """Number of times supervisor has been called (prevent infinite loops)"""
     
@@ -206,6 +213,39 @@ class ConversationState(TypedDict):
 
 # ==================== DEFAULT STATE ====================
 
+# Defaults for every new conversation, built once at import. Mutable
+# fields are left out here and created fresh per conversation.
+_INITIAL_STATE_PROTOTYPE: Dict[str, Any] = dict(
+    # Entity extraction
+    entities_extracted=False,
+    extracted_entities=None,
+    entities_normalized=False,
+    normalized_entities=None,
+    normalized_medications=None,
+    normalized_supplements=None,
+    
+    # Agent checks
+    safety_checked=False,
+    safety_results=None,
+    deficiency_checked=False,
+    deficiency_results=None,
+    recommendations_checked=False,
+    recommendation_results=None,
+    
+    # Supervisor control
+    supervisor_decision="",
+    iterations=0,
+    confidence_level=0.0,
+    
+    # Final output
+    final_answer=None,
+    error_message=None,
+    
+    # Resources
+    graph_interface=None
+)
+
+
 def create_initial_state(
     user_question: str,
     patient_profile: Dict[str, Any]
@@ -213,6 +253,9 @@ def create_initial_state(
     """
     Create initial state for a new conversation
     
+    Copies the module-level defaults and fills in the inputs plus fresh
+    lists for the fields agents append to.
+    
     Args:
         user_question: The user's question
         patient_profile: The patient's health profile
@@ -220,48 +263,21 @@ def create_initial_state(
     Returns:
         ConversationState with default values
     """
-    return ConversationState(
-        # Inputs
-        user_question=user_question,
-        patient_profile=patient_profile,
-        
-        # Entity extraction
-        entities_extracted=False,
-        extracted_entities=None,
-        entities_normalized=False,
-        normalized_entities=None,
-        normalized_medications=None,
-        normalized_supplements=None,
-        
-        # Agent checks
-        safety_checked=False,
-        safety_results=None,
-        deficiency_checked=False,
-        deficiency_results=None,
-        recommendations_checked=False,
-        recommendation_results=None,
-        
-        # Supervisor control
-        supervisor_decision="",
-        iterations=0,
-        confidence_level=0.0,
-        
-        # Messages
-        messages=[
-            {"role": "user", "content": user_question}
-        ],
-        
-        # Evidence & logging
-        evidence_chain=[],
-        query_history=[],
-        
-        # Final output
-        final_answer=None,
-        error_message=None,
-        
-        # Resources
-        graph_interface=None
-    )
+    state = _INITIAL_STATE_PROTOTYPE.copy()
+    
+    # Inputs
+    state['user_question'] = user_question
+    state['patient_profile'] = patient_profile
+    
+    # Mutable fields: never shared between conversations
+    state['pending_checks'] = []
+    state['messages'] = [
+        {"role": "user", "content": user_question}
+    ]
+    state['evidence_chain'] = []
+    state['query_history'] = []
+    
+    return state
 
 
 # ==================== STATE HELPER FUNCTIONS ====================
@@ -350,6 +366,10 @@ def is_max_iterations_reached(state: ConversationState, max_iter: int = 10) -> b
     return state.get('iterations', 0) >= max_iter
 
 
+# Indexed by a done/not-done flag
+_CHECKMARK = ('✗', '✓')
+
+
 def get_state_summary(state: ConversationState) -> str:
     """
     Get a human-readable summary of the current state
@@ -368,11 +388,11 @@ Iterations: {state.get('iterations', 0)}
 Confidence: {state.get('confidence_level', 0):.2f}
 
 Progress:
-  Entities Extracted: {'✓' if state.get('entities_extracted') else '✗'}
-  Entities Normalized: {'✓' if state.get('entities_normalized') else '✗'}
-  Safety Checked: {'✓' if state.get('safety_checked') else '✗'}
-  Deficiency Checked: {'✓' if state.get('deficiency_checked') else '✗'}
-  Recommendations: {'✓' if state.get('recommendations_checked') else '✗'}
+  Entities Extracted: {_CHECKMARK[bool(state.get('entities_extracted'))]}
+  Entities Normalized: {_CHECKMARK[bool(state.get('entities_normalized'))]}
+  Safety Checked: {_CHECKMARK[bool(state.get('safety_checked'))]}
+  Deficiency Checked: {_CHECKMARK[bool(state.get('deficiency_checked'))]}
+  Recommendations: {_CHECKMARK[bool(state.get('recommendations_checked'))]}
 
 Supervisor Decision: {state.get('supervisor_decision', 'None')}
 Evidence Steps: {len(state.get('evidence_chain', []))}
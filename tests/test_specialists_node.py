@@ -0,0 +1,46 @@
+"""
+Merging of the parallel specialists node's per-agent outputs.
+"""
+
+import pytest
+
+pytest.importorskip("langgraph")
+
+from workflow import graph_builder
+
+
+def _agent(evidence: str, query_type: str, confidence=None):
+    """Fake specialist: appends one evidence/history entry, like the real ones."""
+    def run(state):
+        state['evidence_chain'].append(evidence)
+        state['query_history'].append({'query_type': query_type, 'success': True})
+        if confidence is not None:
+            state['confidence_level'] = confidence
+        return state
+    return run
+
+
+def test_merges_every_specialists_evidence_and_history(monkeypatch):
+    agents = {
+        'safety_check': _agent('safety evidence', 'comprehensive_safety', confidence=0.8),
+        'deficiency_check': _agent('deficiency evidence', 'dietary_deficiency'),
+    }
+    monkeypatch.setattr(graph_builder, '_load_specialist', agents.__getitem__)
+    node = graph_builder.make_specialists_node(('safety_check', 'deficiency_check'))
+
+    update = node({
+        'pending_checks': ['safety_check', 'deficiency_check'],
+        'evidence_chain': ['earlier evidence'],
+        'query_history': [{'query_type': 'earlier', 'success': True}],
+        'confidence_level': 0.0,
+    })
+
+    assert update['evidence_chain'] == [
+        'earlier evidence', 'safety evidence', 'deficiency evidence',
+    ]
+    assert [q['query_type'] for q in update['query_history']] == [
+        'earlier', 'comprehensive_safety', 'dietary_deficiency',
+    ]
+    # The deficiency agent left confidence untouched, so safety's stands
+    assert update['confidence_level'] == 0.8
+    assert update['pending_checks'] == []